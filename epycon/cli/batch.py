@@ -1,4 +1,40 @@
+import os
+import shutil
+import logging
 import argparse
+from glob import iglob
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from epycon.core._typing import (
+    Union, List, Dict, Tuple, Iterator, Optional,
+)
+
+from epycon.core.helpers import difftimestamp
+from epycon.core.pipeline import pipeline
+from epycon.core._dataclasses import Header
+from epycon.cli.manifest import Manifest, config_hash, PARTIAL_PREFIX
+
+from epycon.config.byteschema import (
+    ENTRIES_FILENAME, LOG_PATTERN
+)
+
+from epycon.iou import (
+    LogParser,
+    SampleCache,
+    EntryPlanter,
+    CSVPlanter,
+    NPYPlanter,
+    ArrowPlanter,
+    EDFPlanter,
+    HDFPlanter,
+    Mount,
+    readentries,
+)
+
 
 parser = argparse.ArgumentParser()
 
@@ -8,21 +44,632 @@ def parse_arguments():
     Returns:
         parser: CLI arguments
     """
-    # Input and output folder paths    
+    # Input and output folder paths
     parser.add_argument("-i", "--input_folder", type=str,)
     parser.add_argument("-o", "--output_folder", type=str,)
-    
+
     # List of studies that will be exported. All if not provided.
     parser.add_argument("-s", "--studies", type=list,)
 
     # Output format of the waveforms
-    parser.add_argument("-fmt", "--output_format", type=str, choices=['csv', 'hdf'])
+    parser.add_argument("-fmt", "--output_format", type=str, choices=['csv', 'csv.gz', 'csv.zst', 'h5', 'npy', 'arrow', 'parquet', 'edf'])
 
     # Output format of the entries/annotations
     parser.add_argument("-e", "--entries", type=bool,)
     parser.add_argument("-efmt", "--entries_format", type=str, choices=['csv', 'sel'])
 
+    # Number of worker processes converting studies in parallel
+    parser.add_argument("-j", "--jobs", type=int, help="Number of parallel worker processes")
+    parser.add_argument("--schedule", type=str, choices=['studies', 'datalogs'], help="Unit of work scheduled across worker processes")
+
+    # Convert all datalogs regardless of the manifest of previous runs
+    parser.add_argument("--force", action="store_true", help="Reconvert datalogs with up-to-date outputs")
+
     # Overwrite settings with custom config file
     parser.add_argument("--custom_config_path", type=str, help="Path to configuration file")
 
+    # Convert the newest datalog of a study while it is being recorded instead of the batch conversion
+    subparsers = parser.add_subparsers(dest="command")
+    follow = subparsers.add_parser("follow", help="Convert a study while it is being recorded")
+    follow.add_argument("study", type=str, help="Study folder name within the input folder")
+    follow.add_argument("--poll_interval", type=float, help="Seconds between checks of the datalog size")
+    follow.add_argument("--idle_timeout", type=float, help="Seconds without new samples after which the recording is complete")
+
     return parser.parse_args()
+
+
+@dataclass
+class StudyReport:
+    """ Outcome of a study conversion collected by the worker.
+    """
+    study_id: str
+    converted: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    records: List[Tuple[int, str]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.failed
+
+
+class _RecordHandler(logging.Handler):
+    """ Keeps log records of a single study so they can be passed from a worker to the main process.
+    """
+    def __init__(self, records: List[Tuple[int, str]]):
+        super().__init__()
+        self.records = records
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, self.format(record)))
+
+
+@contextmanager
+def _recorded(
+    name: str,
+    records: List[Tuple[int, str]],
+) -> Iterator[logging.Logger]:
+    """ Provides a logger that stores its records into the given list instead of emitting them.
+    """
+    logger = logging.getLogger(f"{__name__}.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = _RecordHandler(records)
+    logger.addHandler(handler)
+
+    try:
+        yield logger
+    finally:
+        logger.removeHandler(handler)
+
+
+def convert_studies(
+    study_paths: List[str],
+    output_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    workers: int = 1,
+    schedule: str = "studies",
+    incremental: bool = True,
+) -> Iterator[StudyReport]:
+    """ Converts studies, in a pool of worker processes if more than one worker is requested.
+
+    Args:
+        study_paths (List[str]): paths to study folders
+        output_folder (Union[str, os.PathLike]): root folder of the converted studies
+        cfg (Dict): validated configuration
+        workers (int, optional): number of worker processes. Defaults to 1.
+        schedule (str, optional): unit of work given to a worker, either whole `studies` or single `datalogs`. Defaults to "studies".
+        incremental (bool, optional): skip datalogs with up-to-date outputs recorded in the manifest. Defaults to True.
+
+    Yields:
+        StudyReport: report of every study in order of completion
+    """
+    if workers > 1 and schedule == "datalogs":
+        yield from _convert_datalogs(study_paths, output_folder, cfg, workers, incremental)
+        return
+
+    if workers <= 1 or len(study_paths) <= 1:
+        for study_path in study_paths:
+            yield convert_study(study_path, output_folder, cfg, incremental)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(convert_study, study_path, output_folder, cfg, incremental): study_path
+            for study_path in study_paths
+            }
+
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # worker died before it could report, e.g. killed by the OS
+                yield StudyReport(os.path.basename(futures[future]), error=repr(e))
+
+
+def _convert_datalogs(
+    study_paths: List[str],
+    output_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    workers: int,
+    incremental: bool = True,
+) -> Iterator[StudyReport]:
+    """ Converts studies with every datalog scheduled as a separate task in a pool of worker processes.
+
+    Studies are prepared and their entries parsed once in the main process, workers receive entries
+    of their datalog only. Manifests are kept by the main process.
+    """
+    reports, pending, futures, manifests = dict(), dict(), dict(), dict()
+    config = config_hash(cfg)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for study_path in study_paths:
+            study_id = os.path.basename(study_path)
+            report = reports[study_id] = StudyReport(study_id)
+
+            with _recorded(study_id, report.records) as logger:
+                try:
+                    study_folder, entries, datalog_paths = _prepare_study(study_path, output_folder, cfg, logger)
+                except Exception as e:
+                    logger.error(f"Conversion of study {study_id} failed: {e!r}")
+                    report.error = repr(e)
+                    datalog_paths = list()
+
+                if datalog_paths:
+                    manifest = manifests[study_id] = Manifest(study_folder, config)
+                    datalog_paths = _outdated(datalog_paths, manifest, incremental, report, logger)
+
+            pending[study_id] = len(datalog_paths)
+            if not datalog_paths:
+                yield report
+                continue
+
+            for datalog_path in datalog_paths:
+                datalog_id = os.path.basename(datalog_path).rstrip(".log")
+                future = executor.submit(
+                    _convert_datalog_task,
+                    datalog_path,
+                    study_folder,
+                    cfg,
+                    [entry for entry in entries if entry.fid == datalog_id],
+                    )
+                futures[future] = (study_id, datalog_id, datalog_path)
+
+        for future in as_completed(futures):
+            study_id, datalog_id, _ = futures[future]
+            report = reports[study_id]
+
+            try:
+                records, outputs, error = future.result()
+            except Exception as e:
+                # worker died before it could report, e.g. killed by the OS
+                records, outputs, error = [(logging.ERROR, f"Conversion of {study_id}/{datalog_id} failed: {e!r}")], list(), repr(e)
+
+            report.records.extend(records)
+            manifests[study_id].record(futures[future][2], outputs, complete=error is None)
+            if error is None:
+                report.converted.append(datalog_id)
+            else:
+                report.failed[datalog_id] = error
+
+            pending[study_id] -= 1
+            if not pending[study_id]:
+                yield report
+
+
+def _convert_datalog_task(
+    datalog_path: Union[str, os.PathLike],
+    study_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    entries: List,
+) -> Tuple[List[Tuple[int, str]], List[str], Optional[str]]:
+    """ Worker task converting a single datalog, returns its log records, output files and error if any.
+    """
+    records = list()
+    study_id = os.path.basename(study_folder)
+    datalog_id = os.path.basename(datalog_path).rstrip(".log")
+
+    with _recorded(f"{study_id}.{datalog_id}", records) as logger:
+        outputs, error = _try_convert_datalog(datalog_path, study_folder, cfg, entries, logger)
+
+    return records, outputs, error
+
+
+def convert_study(
+    study_path: Union[str, os.PathLike],
+    output_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    incremental: bool = True,
+) -> StudyReport:
+    """ Converts datalogs and entries of a single study. A failed datalog does not stop the others.
+
+    Args:
+        study_path (Union[str, os.PathLike]): path to the study folder
+        output_folder (Union[str, os.PathLike]): root folder of the converted studies
+        cfg (Dict): validated configuration
+        incremental (bool, optional): skip datalogs with up-to-date outputs recorded in the manifest. Defaults to True.
+
+    Returns:
+        StudyReport: converted and failed datalogs with log records of the study
+    """
+    study_id = os.path.basename(study_path)
+    report = StudyReport(study_id)
+
+    # collect log records of this study only
+    with _recorded(study_id, report.records) as logger:
+        try:
+            study_folder, entries, datalog_paths = _prepare_study(study_path, output_folder, cfg, logger)
+        except Exception as e:
+            logger.error(f"Conversion of study {study_id} failed: {e!r}")
+            report.error = repr(e)
+            return report
+
+        manifest = Manifest(study_folder, config_hash(cfg))
+
+        for datalog_path in _outdated(datalog_paths, manifest, incremental, report, logger):
+            datalog_id = os.path.basename(datalog_path).rstrip(".log")
+            outputs, error = _try_convert_datalog(datalog_path, study_folder, cfg, entries, logger)
+            manifest.record(datalog_path, outputs, complete=error is None)
+
+            if error is None:
+                report.converted.append(datalog_id)
+            else:
+                report.failed[datalog_id] = error
+
+    return report
+
+
+def _prepare_study(
+    study_path: Union[str, os.PathLike],
+    output_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    logger: logging.Logger,
+) -> Tuple[str, List, List[str]]:
+    """ Creates the study output folder, reads and exports study entries.
+
+    Returns:
+        Tuple[str, List, List[str]]: output folder of the study, entries and paths to datalogs to convert
+    """
+    study_id = os.path.basename(study_path)
+    study_folder = os.path.join(output_folder, study_id)
+    valid_datalogs = set(cfg["data"]["data_files"])
+
+    try:
+        # make output directory
+        os.makedirs(study_folder, exist_ok=True)
+    except OSError as e:
+        raise OSError(f"Unable to create output folder {study_folder}.") from e
+
+    # read entries
+    if cfg["entries"]["convert"]:
+        try:
+            entries = readentries(
+                f_path=os.path.join(study_path, ENTRIES_FILENAME),
+                version=cfg["global_settings"]["workmate_version"],
+                )
+        except OSError as e:
+            logger.warning(f"Could not find ENTRIES log file. Annotation export will be skipped.")
+            entries = list()
+    else:
+        entries = list()
+
+    if cfg["entries"]["summary_csv"] and entries:
+        _store_summary(entries, study_folder, cfg)
+
+    # iterate over datalog files
+    logger.info(f"Converting study {study_id}")
+    datalog_paths = list()
+    for datalog_path in iglob(os.path.join(study_path, LOG_PATTERN)):
+        datalog_id = os.path.basename(datalog_path).rstrip(".log")
+
+        # check if selection of datafiles exists
+        if valid_datalogs and datalog_id not in valid_datalogs:
+            # skip conversion if current datalog is not included
+            continue
+
+        datalog_paths.append(datalog_path)
+
+    return study_folder, entries, datalog_paths
+
+
+def _store_summary(
+    entries: List,
+    study_folder: Union[str, os.PathLike],
+    cfg: Dict,
+) -> None:
+    """ Stores the summary csv containing all entries of the study.
+    """
+    criteria = {
+        "fids": cfg["data"]["data_files"],
+        "groups": cfg["entries"]["filter_annotation_type"],
+        }
+
+    # renamed once written, an interrupted run keeps the previous summary
+    summary_path = os.path.join(study_folder, "entries_summary.csv")
+    EntryPlanter(entries).savecsv(
+        summary_path + ".partial",
+        criteria=criteria,
+    )
+    os.replace(summary_path + ".partial", summary_path)
+
+
+def _outdated(
+    datalog_paths: List[str],
+    manifest: Manifest,
+    incremental: bool,
+    report: StudyReport,
+    logger: logging.Logger,
+) -> List[str]:
+    """ Returns datalogs to convert, up-to-date datalogs are recorded as skipped if incremental.
+    """
+    if not incremental:
+        return datalog_paths
+
+    outdated = list()
+    for datalog_path in datalog_paths:
+        datalog_id = os.path.basename(datalog_path).rstrip(".log")
+
+        if manifest.isuptodate(datalog_path):
+            logger.info(f"Skipping up-to-date {datalog_id}")
+            report.skipped.append(datalog_id)
+        else:
+            outdated.append(datalog_path)
+
+    return outdated
+
+
+def _try_convert_datalog(
+    datalog_path: Union[str, os.PathLike],
+    study_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    entries: List,
+    logger: logging.Logger,
+) -> Tuple[List[str], Optional[str]]:
+    """ Converts a single datalog, logs and returns the error instead of raising it.
+
+    Outputs are written into a partial folder next to the study outputs and moved into the study folder
+    by atomic renames once the conversion completes, so an interrupted conversion leaves no output that
+    looks complete.
+
+    Returns:
+        Tuple[List[str], Optional[str]]: names of the output files and the error if any
+    """
+    study_id = os.path.basename(study_folder)
+    datalog_id = os.path.basename(datalog_path).rstrip(".log")
+    partial_folder = os.path.join(study_folder, PARTIAL_PREFIX + datalog_id)
+
+    logger.info(f"Converting {datalog_id}")
+    try:
+        # leftovers of an interrupted run
+        shutil.rmtree(partial_folder, ignore_errors=True)
+        os.makedirs(partial_folder)
+
+        convert_datalog(datalog_path, partial_folder, cfg, entries)
+
+        outputs = sorted(os.listdir(partial_folder))
+        for name in outputs:
+            os.replace(os.path.join(partial_folder, name), os.path.join(study_folder, name))
+    except Exception as e:
+        logger.error(f"Conversion of {study_id}/{datalog_id} failed: {e!r}")
+        return list(), repr(e)
+    finally:
+        shutil.rmtree(partial_folder, ignore_errors=True)
+
+    return outputs, None
+
+
+def convert_datalog(
+    datalog_path: Union[str, os.PathLike],
+    study_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    entries: List,
+) -> None:
+    """ Converts a single datalog and its entries.
+
+    Args:
+        datalog_path (Union[str, os.PathLike]): path to the datalog
+        study_folder (Union[str, os.PathLike]): output folder of the study
+        cfg (Dict): validated configuration
+        entries (List): entries of the study, at least those of the datalog
+    """
+    datalog_id = os.path.basename(datalog_path).rstrip(".log")
+    output_fmt = cfg["data"]["output_format"]
+    # chunks are handed over between threads when pipelined, buffers can not be reused
+    depth = cfg["global_settings"]["processing"].get("pipeline_depth", 0)
+    # HDF referencing the datablock of the datalog instead of storing samples
+    external = output_fmt == "h5" and cfg["data"].get("hdf", dict()).get("mode") == "external"
+    # local copies of datablocks, not used by external HDF which keeps referencing the datalog
+    cache_cfg = cfg["global_settings"]["processing"].get("cache") or dict()
+    if cache_cfg.get("folder") and not external:
+        cache = SampleCache(cache_cfg["folder"], max_size=cache_cfg.get("max_size"))
+    else:
+        cache = None
+
+    # open parser contex manager
+    with LogParser(
+        datalog_path,
+        version=cfg["global_settings"]["workmate_version"],
+        samplesize=cfg["global_settings"]["processing"]["chunk_size"],
+        # decode only sample columns of the selected channels; custom leads are resolved after the header is read
+        channels=None if cfg["data"]["custom_channels"] else cfg["data"]["channels"],
+        # HDF, NPY and EDF planters store raw counts with the scale
+        dtype="int32" if output_fmt in {"h5", "npy", "edf"} else None,
+        reuse_buffers=not depth,
+        cache=cache,
+    ) as parser:
+        # get datalog header
+        header = parser.get_header()
+
+        # create channel mappings
+        mappings = _channel_mappings(parser, cfg, external)
+
+        # instantiate planter and write data chunks
+        column_names = list(mappings.keys())
+
+        if output_fmt in {"csv", "csv.gz", "csv.zst"}:
+            DataPlanter = CSVPlanter
+        elif output_fmt == "h5":
+            DataPlanter = HDFPlanter
+        elif output_fmt == "npy":
+            DataPlanter = NPYPlanter
+        elif output_fmt in {"arrow", "parquet"}:
+            DataPlanter = ArrowPlanter
+        elif output_fmt == "edf":
+            DataPlanter = EDFPlanter
+        else:
+            raise ValueError
+
+        # instantiate planter with coversion factor for HDF of 1000 -> uV to mV
+        planter_kwargs = dict(
+            column_names=column_names,
+            sampling_freq=header.amp.sampling_freq,
+            factor=1000,
+            resolution=header.amp.resolution if parser.dtype is not None else 1,
+            units="mV",
+            # preallocate output for the whole datalog
+            length=parser.n_selected,
+            )
+
+        if output_fmt == "h5":
+            # storage options of the Data dataset
+            planter_kwargs.update(cfg["data"].get("hdf", dict()))
+        elif output_fmt == "npy":
+            # sample order and header fields of the sidecar
+            planter_kwargs.update(cfg["data"].get("npy", dict()))
+            planter_kwargs["metadata"] = dict(
+                timestamp=header.timestamp,
+                num_channels=header.num_channels,
+                datablock_address=header.datablock_address,
+                amplifier=asdict(header.amp),
+                )
+        elif output_fmt in {"arrow", "parquet"}:
+            # index column, row groups and compression of record batches
+            planter_kwargs.update(cfg["data"].get("arrow", dict()))
+            planter_kwargs.update(timestamp=header.timestamp, offset=parser.start)
+        elif output_fmt == "edf":
+            # record duration, physical range and annotation space of data records
+            planter_kwargs.update(cfg["data"].get("edf", dict()))
+            planter_kwargs.update(
+                timestamp=header.timestamp + parser.start // header.amp.sampling_freq,
+                prefiltering=f"HP:{header.amp.highpass_freq}Hz" + (f" N:{header.amp.notch_freq}Hz" if header.amp.notch_freq else ""),
+                )
+        else:
+            # delimiter, number of decimals and compression of csv
+            planter_kwargs.update(cfg["data"].get("csv", dict()))
+
+        with DataPlanter(
+            os.path.join(study_folder, datalog_id + "." + output_fmt),
+            **planter_kwargs,
+        ) as planter:
+            # compile mappings once per datalog
+            mount = Mount(mappings)
+
+            if external:
+                # reference samples in the datalog, nothing is read
+                planter.add_external(datalog_path, header.datablock_address, parser.n_samples, header.num_channels)
+            elif depth:
+                # overlap reading, computing leads and writing in separate threads
+                pipeline(parser, mount, planter.write, depth=depth)
+            else:
+                # iterate over chunks of data and write to disk
+                leads = None
+                for chunk in parser:
+                    # persistent (samples, leads) buffer for computed leads
+                    if leads is None:
+                        leads = np.empty((len(chunk), len(mount)), dtype=mount.result_dtype(chunk.dtype))
+
+                    # compute leads
+                    chunk = mount(chunk, out=leads[:len(chunk)])
+                    planter.write(chunk)
+
+            # write entries to hdf file
+            if cfg["data"]["pin_entries"] and hasattr(planter, "add_marks"):
+                _pin_entries(planter, entries, datalog_id, header)
+
+    # convert and store entries | csv or sel per each file
+    if cfg["entries"]["convert"] and entries:
+        _store_entries(entries, datalog_id, study_folder, cfg, header, list(mappings.keys()))
+
+
+def _channel_mappings(
+    parser: LogParser,
+    cfg: Dict,
+    external: bool = False,
+) -> Dict:
+    """ Returns mappings of output channels to columns of chunks decoded by the parser.
+
+    Args:
+        parser (LogParser): open parser of the datalog
+        cfg (Dict): validated configuration
+        external (bool, optional): all sample columns of the datablock as they are stored. Defaults to False.
+
+    Returns:
+        Dict: mappings of channel names to columns
+    """
+    header = parser.get_header()
+
+    header.channels.add_custom_mount(cfg["data"]["custom_channels"], override=False)
+    if external:
+        # all sample columns of the datablock as they are stored
+        return {
+            name: (idx,) for idx, name in enumerate(header.channels.column_names(header.num_channels))
+            }
+
+    if cfg["data"]["leads"] == "computed":
+        # use WM defined electrode mount
+        mappings = header.channels.computed_mappings
+    else:
+        # use raw unmounted leads
+        mappings = header.channels.raw_mappings
+
+    # filter out channels not specified by user from mappings
+    if cfg["data"]["channels"]:
+        valid_channels = set(cfg["data"]["channels"])
+        mappings = {key: value for key, value in mappings.items() if key in valid_channels}
+
+    # point mappings to the columns of decoded chunks
+    return parser.remap(mappings)
+
+
+def _pin_entries(
+    planter: Union[HDFPlanter, NPYPlanter, EDFPlanter],
+    entries: List,
+    datalog_id: str,
+    header: Header,
+) -> None:
+    """ Stores entries of the datalog as marks of the planter, previous marks are replaced.
+    """
+    # convert timestamps -> datetimediff -> samples
+    marks = [(
+        e.group,
+        header.amp.sampling_freq*difftimestamp((e.timestamp, header.timestamp)),
+        e.message,
+        ) for e in entries if e.fid == datalog_id
+        ]
+
+    if marks:
+        groups, positions, messages = zip(*marks)
+        # write marks
+        planter.add_marks(
+            positions=positions,
+            groups=groups,
+            messages=messages,
+            )
+
+
+def _store_entries(
+    entries: List,
+    datalog_id: str,
+    study_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    header: Header,
+    column_names: List[str],
+) -> None:
+    """ Stores entries of the datalog as a csv or SignalPlant .sel file.
+    """
+    entryplanter = EntryPlanter(entries)
+    criteria = {
+        "fids": [datalog_id],
+        "groups": cfg["entries"]["filter_annotation_type"],
+    }
+    file_fmt = cfg["entries"]["output_format"]
+
+    if file_fmt == "csv":
+        # store as .csv file
+        entryplanter.savecsv(
+            os.path.join(study_folder, datalog_id + "." + file_fmt),
+            criteria=criteria,
+            ref_timestamp=header.timestamp,
+        )
+    elif file_fmt == "sel":
+        # store as SignalPlant .sel text file
+        entryplanter.savesel(
+            os.path.join(study_folder, datalog_id + "." + file_fmt),
+            header.timestamp,
+            header.amp.sampling_freq,
+            column_names,
+            criteria=criteria,
+        )
+    else:
+        pass
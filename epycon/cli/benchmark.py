@@ -0,0 +1,203 @@
+""" Output size and write time of HDF5 storage settings on a synthetic datalog.
+
+Usage:
+    python -m epycon.cli.benchmark -n 2000000 -c 64 --settings none gzip-4 shuffle+gzip-4
+"""
+import os
+import json
+import time
+import struct
+import argparse
+import tempfile
+
+import numpy as np
+
+from epycon.core._typing import (
+    Union, List, Dict, Optional,
+)
+
+from epycon.config.byteschema import WMx64LogSchema
+from epycon.cli.batch import convert_datalog
+
+
+# storage options of the HDF5 Data dataset compared by the benchmark
+SETTINGS = {
+    "none": {},
+    "lzf": {"compression": "lzf"},
+    "shuffle+lzf": {"compression": "lzf", "shuffle": True},
+    "gzip-1": {"compression": "gzip", "compression_level": 1},
+    "gzip-4": {"compression": "gzip", "compression_level": 4},
+    "gzip-9": {"compression": "gzip", "compression_level": 9},
+    "shuffle+gzip-4": {"compression": "gzip", "compression_level": 4, "shuffle": True},
+    "shuffle+gzip-4+fletcher32": {"compression": "gzip", "compression_level": 4, "shuffle": True, "fletcher32": True},
+    "raw": {"mode": "raw"},
+    "raw+shuffle+gzip-4": {"mode": "raw", "compression": "gzip", "compression_level": 4, "shuffle": True},
+    "raw+scaleoffset": {"mode": "raw", "scaleoffset": True},
+    "raw+scaleoffset+gzip-4": {"mode": "raw", "scaleoffset": True, "compression": "gzip", "compression_level": 4},
+}
+
+# samples generated at once when writing the synthetic datalog
+_BLOCK_SIZE = 65536
+
+
+def write_datalog(
+    f_path: Union[str, os.PathLike],
+    n_samples: int,
+    n_channels: int,
+    sampling_freq: int = 2000,
+    resolution: int = 78,
+    seed: int = 0,
+) -> int:
+    """ Writes a synthetic WorkMate x64 datalog of unipolar channels.
+
+    Channels carry a slow baseline wander, periodic activations and amplifier noise, so that
+    the compression ratio resembles a real recording rather than random data.
+
+    Args:
+        f_path (Union[str, os.PathLike]): path to the datalog
+        n_samples (int): number of samples
+        n_channels (int): number of channels
+        sampling_freq (int, optional): sampling frequency in Hz. Defaults to 2000.
+        resolution (int, optional): amplifier resolution in nV per count. Defaults to 78.
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        int: size of the datablock in bytes
+    """
+    schema = WMx64LogSchema
+    if n_channels > schema.page_size * schema.nb_pages:
+        raise ValueError(f"At most {schema.page_size * schema.nb_pages} channels supported, got {n_channels}.")
+
+    header = bytearray(schema.header.block_size[1])
+
+    startbyte, endbyte = schema.header.timestamp
+    header[startbyte:endbyte] = struct.pack(schema.timestamp_fmt[0], int(time.time()) * schema.timestamp_fmt[1])
+
+    startbyte, endbyte = schema.header.num_channels
+    header[startbyte:endbyte] = struct.pack("<H", n_channels)
+
+    # channel settings, each channel records its own column of the datablock
+    offset = schema.channels.block_size[0]
+    for idx in range(n_channels):
+        channel = bytearray(schema.channels.subblock_size[1])
+        channel[slice(*schema.channels.name)] = f"CH{idx}".encode().ljust(schema.channels.name[1], b"\x00")
+        channel[slice(*schema.channels.ids)] = bytes((idx, 0xff))
+        channel[slice(*schema.channels.input_source)] = bytes((2,))
+        channel[slice(*schema.channels.jbox_pins)] = bytes((idx % 0xff, 0xff))
+
+        header[offset:offset + len(channel)] = channel
+        offset += schema.channel_size
+
+    header[slice(*schema.amplifier.resolution)] = struct.pack("<H", resolution)
+    header[slice(*schema.amplifier.sampling_freq)] = struct.pack("<H", sampling_freq)
+
+    # identity mapping of channel ids into sample columns
+    startbyte, endbyte = schema.datablock.sample_mapping
+    header[startbyte:endbyte] = bytes(idx if idx < n_channels else 0 for idx in range(endbyte - startbyte))
+
+    startbyte, endbyte = schema.datablock.start_address
+    header[startbyte:endbyte] = struct.pack("<H", len(header))
+
+    rng = np.random.default_rng(seed)
+    phase = rng.uniform(0, 2 * np.pi, n_channels)
+    # activation rate of 1-3 Hz per channel
+    rate = rng.uniform(1, 3, n_channels)
+
+    with open(f_path, "wb") as f_obj:
+        f_obj.write(header)
+
+        for start in range(0, n_samples, _BLOCK_SIZE):
+            t = np.arange(start, min(start + _BLOCK_SIZE, n_samples))[:, None] / sampling_freq
+
+            # signal in uV
+            baseline = 200 * np.sin(2 * np.pi * 0.3 * t + phase)
+            cycle = np.mod(t * rate + phase / (2 * np.pi), 1.0)
+            activation = 2000 * np.exp(-((cycle - 0.5) * 40) ** 2) * np.sin(2 * np.pi * 40 * t)
+            noise = rng.normal(0, 10, (len(t), n_channels))
+
+            counts = np.rint((baseline + activation + noise) * 1000 / resolution)
+            f_obj.write(counts.astype("<i4").tobytes())
+
+    return n_samples * n_channels * schema.sample_size
+
+
+def run(
+    datalog_path: Union[str, os.PathLike],
+    output_folder: Union[str, os.PathLike],
+    settings: List[str],
+    chunks: Optional[List[int]] = None,
+    cache_size: Optional[int] = None,
+    repeat: int = 1,
+) -> List[Dict]:
+    """ Converts the datalog into HDF5 with each setting and measures the output size and write time.
+
+    Args:
+        datalog_path (Union[str, os.PathLike]): path to the datalog
+        output_folder (Union[str, os.PathLike]): folder for the converted files, removed after each setting
+        settings (List[str]): names of settings from `SETTINGS`
+        chunks (Optional[List[int]], optional): chunk shape [samples, channels]. Defaults to None.
+        cache_size (Optional[int], optional): chunk cache size in bytes. Defaults to None.
+        repeat (int, optional): number of conversions per setting, the fastest one is reported. Defaults to 1.
+
+    Returns:
+        List[Dict]: setting name, output size in bytes and write time in seconds
+    """
+    with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "config.json"), "r") as f:
+        cfg = json.load(f)
+
+    cfg["data"].update(output_format="h5", pin_entries=False, leads="original", channels=[], custom_channels={})
+    cfg["entries"]["convert"] = False
+
+    datalog_id = os.path.basename(datalog_path).rstrip(".log")
+    output_path = os.path.join(output_folder, datalog_id + ".h5")
+
+    # settings are applied over the configured HDF options, e.g. layout and envelopes
+    hdf = cfg["data"].get("hdf", dict())
+
+    results = list()
+    for name in settings:
+        cfg["data"]["hdf"] = dict(hdf, **SETTINGS[name], chunks=chunks, cache_size=cache_size)
+
+        elapsed = float("Inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            convert_datalog(datalog_path, output_folder, cfg, list())
+            elapsed = min(elapsed, time.perf_counter() - start)
+
+        results.append({"setting": name, "size": os.path.getsize(output_path), "time": elapsed})
+        os.remove(output_path)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Output size and write time of HDF5 storage settings.")
+    parser.add_argument("-n", "--samples", type=int, default=2_000_000, help="Number of samples of the synthetic datalog")
+    parser.add_argument("-c", "--channels", type=int, default=64, help="Number of channels of the synthetic datalog")
+    parser.add_argument("--settings", nargs="+", choices=list(SETTINGS), default=list(SETTINGS), help="Settings to compare")
+    parser.add_argument("--chunks", nargs=2, type=int, metavar=("SAMPLES", "CHANNELS"), help="Chunk shape")
+    parser.add_argument("--cache_size", type=int, help="Chunk cache size in bytes")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of conversions per setting")
+    parser.add_argument("-o", "--output_folder", type=str, help="Working folder, temporary if not provided")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.output_folder) as folder:
+        datalog_path = os.path.join(folder, "00000000.log")
+        raw_size = write_datalog(datalog_path, args.samples, args.channels)
+
+        results = run(datalog_path, folder, args.settings, args.chunks, args.cache_size, args.repeat)
+
+    print(f"{args.samples} samples x {args.channels} channels, datablock {raw_size / 2**20:.1f} MiB")
+    print(f"{'setting':<28}{'size [MiB]':>12}{'ratio':>8}{'time [s]':>10}{'MiB/s':>10}")
+    for item in results:
+        print(
+            f"{item['setting']:<28}"
+            f"{item['size'] / 2**20:>12.1f}"
+            f"{item['size'] / raw_size:>8.3f}"
+            f"{item['time']:>10.2f}"
+            f"{raw_size / 2**20 / item['time']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import os
+import shutil
+import logging
+from glob import glob
+
+import numpy as np
+
+from epycon.core._typing import (
+    Union, List, Dict, Tuple, Optional,
+)
+from epycon.core._dataclasses import Header
+
+from epycon.cli.batch import _channel_mappings, _pin_entries, _store_entries, _store_summary
+from epycon.cli.manifest import Manifest, config_hash, PARTIAL_PREFIX, _fingerprint
+
+from epycon.config.byteschema import (
+    ENTRIES_FILENAME, LOG_PATTERN
+)
+
+from epycon.iou import (
+    LogParser,
+    CSVPlanter,
+    HDFPlanter,
+    Mount,
+    readentries,
+)
+
+
+# output formats that can be appended by chunks of unknown total length
+FOLLOW_FORMATS = {"csv", "csv.gz", "csv.zst", "h5"}
+
+
+class _EntriesWatcher:
+    """ Re-reads the entries file of a study whenever its size or modification time changes.
+    """
+    def __init__(
+        self,
+        study_path: Union[str, os.PathLike],
+        cfg: Dict,
+        logger: logging.Logger,
+    ) -> None:
+
+        self.f_path = os.path.join(study_path, ENTRIES_FILENAME)
+        self.version = cfg["global_settings"]["workmate_version"]
+        self.enabled = cfg["entries"]["convert"] or cfg["data"]["pin_entries"]
+        self.logger = logger
+        self.entries = list()
+        self._fingerprint = None
+
+    def refresh(self) -> bool:
+        """ Reads the entries file if it changed since the last call.
+
+        Returns:
+            bool: True if entries were read again
+        """
+        fingerprint = _fingerprint(self.f_path)
+        if not self.enabled or fingerprint is None or fingerprint == self._fingerprint:
+            return False
+
+        try:
+            entries = readentries(f_path=self.f_path, version=self.version)
+        except Exception as e:
+            # entry being written, read again at the next refresh
+            self.logger.warning(f"Could not read {self.f_path}: {e!r}")
+            return False
+
+        self.entries = entries
+        self._fingerprint = fingerprint
+
+        return True
+
+
+def follow_study(
+    study_path: Union[str, os.PathLike],
+    output_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    poll_interval: float = 1.0,
+    idle_timeout: float = 60.0,
+    logger: Optional[logging.Logger] = None,
+) -> List[str]:
+    """ Converts datalogs of a study while they are being recorded.
+
+    The newest datalog of the study is followed until it stops growing for `idle_timeout` seconds, then
+    the next datalog is followed if the recording continued into a new one. Samples are appended to the
+    output as soon as complete samples appear, entries are pinned and the output is flushed whenever the
+    conversion catches up with the recording. Outputs are written into the partial folder of the datalog
+    and appear under their final names once the datalog is complete. Datalogs recorded before the newest
+    one are left to the batch conversion. Interruption by Ctrl+C completes the output of the followed
+    datalog, which is recorded as incomplete in the manifest so that the next batch run converts it again.
+    The entries summary is stored at the end.
+
+    Args:
+        study_path (Union[str, os.PathLike]): path to the study folder
+        output_folder (Union[str, os.PathLike]): root folder of the converted studies
+        cfg (Dict): validated configuration
+        poll_interval (float, optional): seconds between checks of the datalog size. Defaults to 1.0.
+        idle_timeout (float, optional): seconds without new samples after which a datalog is complete. Defaults to 60.0.
+        logger (Optional[logging.Logger], optional): logger of the progress. Defaults to the module logger.
+
+    Raises:
+        ValueError: output format that can not be appended
+
+    Returns:
+        List[str]: identifiers of followed datalogs
+    """
+    logger = logger or logging.getLogger(__name__)
+    output_fmt = cfg["data"]["output_format"]
+
+    if output_fmt not in FOLLOW_FORMATS or (output_fmt == "h5" and cfg["data"].get("hdf", dict()).get("mode") == "external"):
+        raise ValueError(f"Following a recording supports {sorted(FOLLOW_FORMATS)} output formats without external HDF mode, got {output_fmt}.")
+
+    study_id = os.path.basename(study_path)
+    study_folder = os.path.join(output_folder, study_id)
+    os.makedirs(study_folder, exist_ok=True)
+
+    manifest = Manifest(study_folder, config_hash(cfg))
+    watcher = _EntriesWatcher(study_path, cfg, logger)
+
+    followed = list()
+    while True:
+        # datalogs are numbered in the order of recording
+        datalog_paths = sorted(glob(os.path.join(study_path, LOG_PATTERN)))
+        if not datalog_paths or os.path.basename(datalog_paths[-1]).rstrip(".log") in followed:
+            break
+
+        datalog_path = datalog_paths[-1]
+        datalog_id = os.path.basename(datalog_path).rstrip(".log")
+        followed.append(datalog_id)
+
+        logger.info(f"Following {study_id}/{datalog_id}")
+        outputs, interrupted = follow_datalog(datalog_path, study_folder, cfg, watcher, poll_interval, idle_timeout)
+        # output of an interrupted datalog may miss recorded samples, batch converts it again
+        manifest.record(datalog_path, outputs, complete=not interrupted)
+        logger.info(f"Converted {study_id}/{datalog_id}")
+
+        if interrupted:
+            break
+
+    if cfg["entries"]["convert"] and cfg["entries"]["summary_csv"] and watcher.entries:
+        _store_summary(watcher.entries, study_folder, cfg)
+
+    return followed
+
+
+def follow_datalog(
+    datalog_path: Union[str, os.PathLike],
+    study_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    watcher: _EntriesWatcher,
+    poll_interval: float = 1.0,
+    idle_timeout: float = 60.0,
+) -> Tuple[List[str], bool]:
+    """ Converts a single datalog while it is being recorded.
+
+    Outputs are appended in the partial folder of the datalog and moved into the study folder once following
+    ends, the same way as batch conversion does, so outputs under their final names are never being written.
+    A process killed while following leaves the partial folder only, which the next batch run replaces.
+    HDF outputs are not written in SWMR mode and can not be opened by other processes until following ends.
+
+    Returns:
+        Tuple[List[str], bool]: names of the output files and whether following was interrupted
+    """
+    datalog_id = os.path.basename(datalog_path).rstrip(".log")
+    output_fmt = cfg["data"]["output_format"]
+    partial_folder = os.path.join(study_folder, PARTIAL_PREFIX + datalog_id)
+    interrupted = False
+
+    # leftovers of an interrupted run
+    shutil.rmtree(partial_folder, ignore_errors=True)
+    os.makedirs(partial_folder)
+
+    try:
+        with LogParser(
+            datalog_path,
+            version=cfg["global_settings"]["workmate_version"],
+            samplesize=cfg["global_settings"]["processing"]["chunk_size"],
+            channels=None if cfg["data"]["custom_channels"] else cfg["data"]["channels"],
+            dtype="int32" if output_fmt == "h5" else None,
+            reuse_buffers=True,
+            follow=True,
+            poll_interval=poll_interval,
+            idle_timeout=idle_timeout,
+        ) as parser:
+            header = parser.get_header()
+            mappings = _channel_mappings(parser, cfg)
+            column_names = list(mappings.keys())
+
+            # length of the recording is unknown, outputs grow with every chunk
+            planter_kwargs = dict(
+                column_names=column_names,
+                sampling_freq=header.amp.sampling_freq,
+                factor=1000,
+                resolution=header.amp.resolution if parser.dtype is not None else 1,
+                units="mV",
+                )
+
+            if output_fmt == "h5":
+                DataPlanter = HDFPlanter
+                planter_kwargs.update(cfg["data"].get("hdf", dict()))
+            else:
+                DataPlanter = CSVPlanter
+                planter_kwargs.update(cfg["data"].get("csv", dict()))
+
+            with DataPlanter(
+                os.path.join(partial_folder, datalog_id + "." + output_fmt),
+                **planter_kwargs,
+            ) as planter:
+                mount = Mount(mappings)
+
+                leads = None
+                try:
+                    for chunk in parser:
+                        if leads is None:
+                            leads = np.empty((parser.samplesize, len(mount)), dtype=mount.result_dtype(chunk.dtype))
+
+                        planter.write(mount(chunk, out=leads[:len(chunk)]))
+
+                        # chunks shorter than the chunk size end at the last recorded sample
+                        if len(chunk) < parser.samplesize:
+                            _update_entries(planter, watcher, datalog_id, partial_folder, cfg, header, column_names)
+                            planter.flush()
+                except KeyboardInterrupt:
+                    # end of the case, complete the output written so far
+                    interrupted = True
+
+                _update_entries(planter, watcher, datalog_id, partial_folder, cfg, header, column_names, force=True)
+
+        outputs = sorted(os.listdir(partial_folder))
+        for name in outputs:
+            os.replace(os.path.join(partial_folder, name), os.path.join(study_folder, name))
+    finally:
+        shutil.rmtree(partial_folder, ignore_errors=True)
+
+    return outputs, interrupted
+
+
+def _update_entries(
+    planter: Union[CSVPlanter, HDFPlanter],
+    watcher: _EntriesWatcher,
+    datalog_id: str,
+    study_folder: Union[str, os.PathLike],
+    cfg: Dict,
+    header: Header,
+    column_names: List[str],
+    force: bool = False,
+) -> None:
+    """ Pins and stores entries of the datalog if the entries file changed.
+    """
+    if not watcher.refresh() and not force:
+        return
+
+    entries = watcher.entries
+
+    if cfg["data"]["pin_entries"] and hasattr(planter, "add_marks"):
+        _pin_entries(planter, entries, datalog_id, header)
+
+    if cfg["entries"]["convert"] and entries:
+        _store_entries(entries, datalog_id, study_folder, cfg, header, column_names)
@@ -0,0 +1,159 @@
+import os
+import json
+import hashlib
+
+from epycon.core._typing import (
+    Union, List, Dict, Optional,
+)
+
+from epycon.config.byteschema import ENTRIES_FILENAME
+
+
+# name of the manifest stored in every study output folder
+MANIFEST_FILENAME = "manifest.json"
+# prefix of the folder holding outputs of a datalog until they are complete
+PARTIAL_PREFIX = ".partial-"
+
+_VERSION = 1
+
+
+def config_hash(cfg: Dict) -> str:
+    """ Returns a digest of configuration sections that affect the converted files.
+
+    Paths, processing and credentials do not change the content of outputs and are left out, so that
+    e.g. a different number of workers does not invalidate previous conversions.
+
+    Args:
+        cfg (Dict): validated configuration
+
+    Returns:
+        str: hexadecimal SHA-256 digest
+    """
+    relevant = {
+        "data": cfg["data"],
+        "entries": cfg["entries"],
+        "global_settings": {
+            key: value for key, value in cfg["global_settings"].items() if key not in {"processing", "credentials"}
+            },
+        }
+
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode("UTF-8")).hexdigest()
+
+
+def _fingerprint(f_path: Union[str, os.PathLike]) -> Optional[Dict[str, int]]:
+    """ Returns size and modification time of a file, None if it does not exist.
+    """
+    try:
+        stat = os.stat(f_path)
+    except FileNotFoundError:
+        return None
+
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+class Manifest:
+    """ Record of datalogs converted into a study output folder.
+
+    For each datalog it keeps the size and modification time of the datalog and of the study entries,
+    the configuration hash, names of the output files and whether the conversion completed. A datalog
+    is up to date if all of them match and its outputs exist. The manifest is rewritten atomically after
+    every change, so an interrupted run leaves a consistent record of datalogs converted so far.
+    """
+
+    def __init__(
+        self,
+        study_folder: Union[str, os.PathLike],
+        config: str,
+    ) -> None:
+
+        self.study_folder = study_folder
+        self.f_path = os.path.join(study_folder, MANIFEST_FILENAME)
+        self.config = config
+
+        try:
+            with open(self.f_path, "r") as f_obj:
+                content = json.load(f_obj)
+        except (FileNotFoundError, ValueError):
+            # missing or damaged manifest, everything is converted again
+            content = dict()
+
+        self.datalogs = content.get("datalogs", dict()) if content.get("version") == _VERSION else dict()
+
+    def isuptodate(
+        self,
+        datalog_path: Union[str, os.PathLike],
+    ) -> bool:
+        """ Whether outputs of the datalog are complete and converted from the same sources and configuration.
+
+        Args:
+            datalog_path (Union[str, os.PathLike]): path to the datalog
+
+        Returns:
+            bool: True if the conversion can be skipped
+        """
+        record = self.datalogs.get(_datalog_id(datalog_path))
+
+        return (
+            record is not None
+            and record.get("complete", False)
+            and record.get("config") == self.config
+            and record.get("source") == _fingerprint(datalog_path)
+            and record.get("entries") == _fingerprint(_entries_path(datalog_path))
+            and all(os.path.isfile(os.path.join(self.study_folder, name)) for name in record.get("outputs", list()))
+            )
+
+    def record(
+        self,
+        datalog_path: Union[str, os.PathLike],
+        outputs: List[str],
+        complete: bool,
+    ) -> None:
+        """ Records the result of a datalog conversion and stores the manifest.
+
+        Outputs of the previous complete conversion that the new one did not produce, e.g. files of another
+        output format, are removed so that the study folder does not mix outputs of different configurations.
+
+        Args:
+            datalog_path (Union[str, os.PathLike]): path to the datalog
+            outputs (List[str]): names of output files in the study folder
+            complete (bool): whether the conversion completed
+        """
+        previous = self.datalogs.get(_datalog_id(datalog_path), dict()).get("outputs", list())
+        if complete:
+            for name in set(previous) - set(outputs):
+                try:
+                    os.remove(os.path.join(self.study_folder, name))
+                except FileNotFoundError:
+                    pass
+        else:
+            # previous outputs are removed by the next complete conversion
+            outputs = list(set(previous) | set(outputs))
+
+        self.datalogs[_datalog_id(datalog_path)] = {
+            "source": _fingerprint(datalog_path),
+            "entries": _fingerprint(_entries_path(datalog_path)),
+            "config": self.config,
+            "outputs": sorted(outputs),
+            "complete": complete,
+            }
+
+        self.save()
+
+    def save(self) -> None:
+        """ Writes the manifest under a temporary name and renames it over the previous one.
+        """
+        content = {"version": _VERSION, "datalogs": self.datalogs}
+
+        partial_path = self.f_path + ".partial"
+        with open(partial_path, "w") as f_obj:
+            json.dump(content, f_obj, indent=2, sort_keys=True)
+
+        os.replace(partial_path, self.f_path)
+
+
+def _datalog_id(datalog_path: Union[str, os.PathLike]) -> str:
+    return os.path.basename(datalog_path).rstrip(".log")
+
+
+def _entries_path(datalog_path: Union[str, os.PathLike]) -> str:
+    return os.path.join(os.path.dirname(datalog_path), ENTRIES_FILENAME)
@@ -48,17 +48,32 @@ class Channels:
     mount: Dict
         
     def add_custom_mount(self, mount: Dict, override: bool = False):
-        """ Create custom mapping for computing bipolar leads.
+        """ Create custom mapping for computing bipolar leads or weighted sums of channels.
 
         Args:
+            mount (Dict): lead names mapped either to one or two indices into `content` (unipolar or bipolar lead),
+                or to weights of channels given by name or index into `content`, e.g. {"WCT": {"RA": 1/3, "LA": 1/3, "LL": 1/3}}
             override (bool, optional): _description_. Defaults to False.
         """
         # validate user-defined electrical references
         if not mount:
             return
         
-        for _, item in mount:
+        indices = {item.name: idx for idx, item in enumerate(self.content)}
+
+        mount = dict(mount)
+        for key, item in mount.items():
+            if isinstance(item, dict):
+                # translate channel names into indices of the channel list
+                try:
+                    item = {indices[name] if isinstance(name, str) else name: weight for name, weight in item.items()}
+                except KeyError as e:
+                    raise ValueError(f"Unknown channel {e} in custom lead `{key}`")
+            else:
+                item = tuple(item)
+
             _validate_mount(item, max=len(self.content)-1)
+            mount[key] = item
 
         if override:
             self.mount = mount
@@ -69,10 +84,32 @@ class Channels:
     def raw_mappings(self):
         return {item.name:(item.reference,) for item in self.content}
 
+    def column_names(self, n_columns: int) -> List[str]:
+        """ Names of the sample columns of the datablock, columns of no channel are named by their index.
+
+        A column referenced by several channels keeps the name of the first one, e.g. the unipolar channel
+        rather than the helper entries of bipolar leads that follow it.
+
+        Args:
+            n_columns (int): number of sample columns, i.e. `Header.num_channels`
+        """
+        names = [str(idx) for idx in range(n_columns)]
+        named = set()
+        for item in self.content:
+            if item.reference is not None and item.reference < n_columns and item.reference not in named:
+                names[item.reference] = item.name
+                named.add(item.reference)
+
+        return names
+
     @property
     def computed_mappings(self):
         mappings = dict()
         for key, indices in self.mount.items():
+            if isinstance(indices, dict):
+                mappings[key] = {self.content[idx].reference: weight for idx, weight in indices.items()}
+                continue
+
             if len(indices) == 1:
                 mappings[key] = (self.content[indices[0]].reference,)
             
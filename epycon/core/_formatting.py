@@ -1,5 +1,6 @@
 import os
 import json
+import numpy as np
 from numpy import savetxt
 from datetime import datetime
 from collections import OrderedDict
@@ -13,9 +14,12 @@ from epycon.core._validators import (
 )
 
 from epycon.core._typing import (
-    Union, PathLike, List, Dict, Tuple
+    Union, PathLike, List, Dict, Tuple, NumpyArray
 )
 
+# magnitude of scaled values formatted by the vectorized int64 conversion
+_INT64_LIMIT = 2.0 ** 63
+
 @dataclass
 class SignalPlantDefaults:
     CHANNEL_SETTINGS = OrderedDict([    
@@ -188,4 +192,110 @@ def _tosel(
         '%Divided by: ASCII char no. 9\n'
         '%DATA------------------------------------\n'
         f'{output_txt}\n'    
-    )
\ No newline at end of file
+    )
+
+
+def _tocsvrows_printf(
+        darray: NumpyArray,
+        delimiter: str,
+        precision: Union[int, None],
+        ) -> bytes:
+    """ Formats samples as csv rows by printf-style formatting, integers truncated towards zero if precision is None.
+    """
+    darray = darray.astype(np.float64, copy=False)
+    if precision is None:
+        precision = 0
+        darray = np.trunc(darray)
+
+    fmt = delimiter.join([f"%.{precision}f"] * darray.shape[1]) + "\n"
+
+    return "".join(fmt % tuple(row) for row in darray).encode("ascii")
+
+
+def _tocsvrows(
+        darray: NumpyArray,
+        delimiter: str = ',',
+        precision: Union[int, None] = None,
+        ) -> bytes:
+    """ Formats samples as csv rows with vectorized number-to-text conversion.
+
+    Characters are composed position by position for all values at once into a byte matrix padded
+    with NUL bytes, which are dropped when the matrix is joined into rows. Memory is proportional
+    to the number of values, so large chunks should be passed in blocks of rows.
+
+    Args:
+        darray (NumpyArray): samples of shape (rows, columns)
+        delimiter (str, optional): single-character column delimiter. Defaults to ','.
+        precision (Union[int, None], optional): number of decimals rounded half away from zero, integers truncated towards zero (as `%d`) if None. Defaults to None.
+
+    Returns:
+        bytes: ASCII csv rows terminated by newline
+    """
+    # printf-style formatting of out of range values takes the precision as given
+    requested = precision
+
+    if precision is None:
+        precision = 0
+        if np.issubdtype(darray.dtype, np.integer):
+            values = darray.astype(np.int64, copy=False)
+        else:
+            values = np.trunc(darray.astype(np.float64, copy=False))
+    else:
+        # scaled in double precision, float32 lacks digits for the decimals
+        values = darray.astype(np.float64) * 10.0 ** precision
+        values = np.trunc(values + np.copysign(0.5, values))
+
+    if values.dtype.kind == "f":
+        if not np.all(np.abs(values) < _INT64_LIMIT):
+            # values out of the int64 range or not finite are formatted one by one
+            return _tocsvrows_printf(darray, delimiter, requested)
+        values = values.astype(np.int64)
+
+    n_rows, n_cols = values.shape
+    if not values.size:
+        return b''
+
+    negative = (values < 0).ravel()
+    magnitude = np.abs(values).ravel().view(np.uint64)
+    signed = bool(negative.any())
+
+    # at least one digit in front of the decimal point
+    min_digits = precision + 1
+    max_digits = max(len(str(magnitude.max())), min_digits)
+
+    # narrow integers are divided considerably faster
+    if max_digits < 10:
+        magnitude = magnitude.astype(np.uint32)
+
+    # one row of characters per position within a cell, i.e. sign, digits, decimal point and delimiter
+    cell = max_digits + (precision > 0) + signed + 1
+    out = np.empty((cell, values.size), dtype=np.uint8)
+
+    # digits from the least significant one, positions in front of a value are NUL
+    row = cell - 2
+    for idx in range(max_digits):
+        if precision and idx == precision:
+            out[row] = ord('.')
+            row -= 1
+
+        empty = magnitude == 0 if idx >= min_digits else None
+        magnitude, digit = np.divmod(magnitude, 10)
+        np.add(digit, ord('0'), out=out[row], casting='unsafe')
+
+        if empty is not None:
+            out[row] *= ~empty
+            if signed:
+                # sign in front of the most significant digit
+                sign = empty & negative
+                out[row] += sign * np.uint8(ord('-'))
+                negative &= ~sign
+
+        row -= 1
+
+    if signed:
+        out[row] = negative * np.uint8(ord('-'))
+
+    out[-1] = ord(delimiter)
+    out[-1].reshape(n_rows, n_cols)[:, -1] = ord('\n')
+
+    return out.T.tobytes().translate(None, b'\x00')
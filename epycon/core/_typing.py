@@ -11,6 +11,7 @@ if sys.version_info >= (3, 6):
         Any as Any,
         Callable,
         Iterator,
+        Iterable,
         Optional,
     )
 
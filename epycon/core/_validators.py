@@ -113,24 +113,31 @@ def _validate_reference(positive_ref, negative_ref):
         raise ValueError        
 
 
-def _validate_mount(mount: tuple, max: int):
-    """ Validates custom mount schema for computing bipolar leads.
+def _validate_mount(mount: Union[tuple, dict], max: int):
+    """ Validates custom mount schema for computing bipolar leads or weighted sums of channels.
 
     Args:
-        mount (tuple): 
+        mount (Union[tuple, dict]): one or two indices of electrical sources, or weights of electrical sources given by index
 
     Raises:
         ValueError: _description_
         ValueError: _description_
     """
-    if len(tuple) > 2:
-        raise ValueError(f"Too many electrical sources for lead computation. Expected 2, got {len(tuple)}")
+    if not mount:
+        raise ValueError("No electrical source for lead computation.")
+
+    if isinstance(mount, dict):
+        for weight in mount.values():
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise TypeError(f"Weights of electrical sources require type `float` not {type(weight)}")
+    elif len(mount) > 2:
+        raise ValueError(f"Too many electrical sources for lead computation. Expected 2, got {len(mount)}")
     
-    for item in tuple:
+    for item in mount:
         if not isinstance(item, int):
             raise TypeError(f"Electrical sources for lead computation requires type `int` not {type(item)}")
         
-        if item > max:
+        if not 0 <= item <= max:
             raise IndexError(f"Index {item} of the electrical source out of bounds. Max. {max}")
 
 
@@ -164,6 +171,8 @@ def _validate_tuple(
 
     if not all(isinstance(item, dtype) for item in arr):
         raise TypeError(messsage)
+
+    return arr
     
 
 def _validate_path(
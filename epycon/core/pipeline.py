@@ -0,0 +1,115 @@
+import threading
+from queue import Queue, Empty, Full
+
+from epycon.core._typing import (
+    Any, Callable, Iterable, Iterator, List,
+)
+
+
+# sentinel closing a queue
+_END = object()
+
+# period of checking the stop flag by blocked stages in seconds
+_POLL_INTERVAL = 0.1
+
+
+def pipeline(
+    source: Iterable,
+    *stages: Callable,
+    depth: int = 2,
+) -> int:
+    """ Passes items of the source through stages, each running in its own thread.
+
+    Stages are joined by bounded queues, so reading, computing and writing of consecutive
+    items overlap and throughput approaches the slowest stage instead of the sum of all stages.
+    The source is iterated in a reader thread, intermediate stages in worker threads and the
+    last stage (the sink) in the calling thread. Items are kept in order.
+
+    Items are handed over between threads, so neither the source nor the stages may reuse
+    buffers of previously produced items.
+
+    Args:
+        source (Iterable): producer of items, e.g. a LogParser
+        *stages (Callable): functions applied to each item in order, return value of the last one is discarded
+        depth (int, optional): capacity of each queue in items, 0 runs sequentially in the calling thread. Defaults to 2.
+
+    Raises:
+        ValueError: no stage given or negative depth
+        Exception: the first exception raised by any stage or the source
+
+    Returns:
+        int: number of items passed to the sink
+    """
+    if not stages:
+        raise ValueError("Pipeline requires at least one stage")
+    if depth < 0:
+        raise ValueError(f"Invalid pipeline depth {depth}, expected non-negative integer")
+
+    if depth == 0:
+        count = 0
+        for item in source:
+            for stage in stages:
+                item = stage(item)
+            count += 1
+
+        return count
+
+    stop = threading.Event()
+    errors: List[BaseException] = list()
+    queues = [Queue(maxsize=depth) for _ in stages]
+
+    def put(queue: Queue, item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def drain(queue: Queue) -> Iterator:
+        while not stop.is_set():
+            try:
+                item = queue.get(timeout=_POLL_INTERVAL)
+            except Empty:
+                continue
+            if item is _END:
+                return
+            yield item
+
+    def work(items: Iterable, func: Callable, outbox: Queue) -> None:
+        try:
+            for item in items:
+                if not put(outbox, item if func is None else func(item)):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        else:
+            put(outbox, _END)
+
+    # reader and intermediate stages
+    threads = [threading.Thread(target=work, args=(source, None, queues[0]), daemon=True)]
+    for idx, stage in enumerate(stages[:-1]):
+        threads.append(
+            threading.Thread(target=work, args=(drain(queues[idx]), stage, queues[idx + 1]), daemon=True)
+            )
+
+    for thread in threads:
+        thread.start()
+
+    count = 0
+    try:
+        for item in drain(queues[-1]):
+            stages[-1](item)
+            count += 1
+    finally:
+        # release stages blocked on full queues if the sink failed
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+    return count
@@ -1,10 +1,13 @@
-from iou.parsers import (
+from epycon.iou.parsers import (
     LogParser,
+    Mount,
     _readmaster as readmaster,
     _readentries as readentries,
     _mount_channels as mount_channels
 )
 
-from iou.planters import (
-    EntryPlanter, CSVPlanter, HDFPlanter
+from epycon.iou.cache import SampleCache
+
+from epycon.iou.planters import (
+    EntryPlanter, CSVPlanter, NPYPlanter, ArrowPlanter, EDFPlanter, HDFPlanter
 )
\ No newline at end of file
@@ -0,0 +1,188 @@
+import os
+import time
+import hashlib
+from warnings import warn
+
+import numpy as np
+
+from epycon.core._typing import (
+    Union, Optional, Tuple,
+)
+
+from epycon.core._validators import _validate_int
+
+
+class SampleCache:
+    """ Local copies of datalog datablocks as .npy files, shared by conversions with different configurations.
+
+    Entries are raw sample matrices of shape (samples, columns) as stored in the datablock rather than
+    decoded and scaled samples; the two's complement fix-up and scaling still run on every read, while
+    channel selection, leads, data type and output format may change without reading the datalog again. They are
+    keyed by a fingerprint of the datalog computed from its size, header and evenly spaced blocks of the
+    datablock, without reading the whole file. Entries are evicted in least recently used order once the
+    cache exceeds its size limit.
+    """
+
+    # number and size in bytes of datablock blocks read by the fingerprint
+    _SAMPLED_BLOCKS = 16
+    _SAMPLED_BLOCK_SIZE = 2**16
+    # bytes copied at once into a new entry
+    _COPY_BLOCK_SIZE = 2**24
+    _EXTENSION = ".npy"
+
+    def __init__(
+        self,
+        folder: Union[str, os.PathLike],
+        max_size: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            folder (Union[str, os.PathLike]): cache folder, created if it does not exist
+            max_size (Optional[int], optional): size limit of the cache in bytes, unlimited if not provided. Defaults to None.
+        """
+        self.folder = folder
+        self.max_size = _validate_int("cache size", max_size, min_value=0) if max_size is not None else None
+
+        os.makedirs(folder, exist_ok=True)
+
+    def fingerprint(
+        self,
+        f_path: Union[str, os.PathLike],
+        header_size: int,
+        salt: str = "",
+    ) -> str:
+        """ Returns content fingerprint of the datalog.
+
+        Args:
+            f_path (Union[str, os.PathLike]): path to the datalog
+            header_size (int): size of the header in bytes, i.e. address of the datablock
+            salt (str, optional): additional key, e.g. name of the byte schema. Defaults to "".
+
+        Returns:
+            str: hexadecimal SHA-256 digest
+        """
+        size = os.path.getsize(f_path)
+        digest = hashlib.sha256(f"{salt}:{size}:".encode("UTF-8"))
+
+        with open(f_path, "rb") as f_obj:
+            digest.update(f_obj.read(header_size))
+
+            # evenly spaced blocks of the datablock including the last one
+            last = max(header_size, size - self._SAMPLED_BLOCK_SIZE)
+            for offset in np.linspace(header_size, last, self._SAMPLED_BLOCKS, dtype=np.int64):
+                f_obj.seek(int(offset))
+                digest.update(f_obj.read(self._SAMPLED_BLOCK_SIZE))
+
+        return digest.hexdigest()
+
+    def get(
+        self,
+        key: str,
+    ) -> Optional[np.ndarray]:
+        """ Returns the read-only memory-mapped entry and marks it as recently used, None if not cached.
+
+        Args:
+            key (str): fingerprint of the datalog
+
+        Returns:
+            Optional[np.ndarray]: samples of shape (samples, columns)
+        """
+        f_path = self._path(key)
+
+        try:
+            datablock = np.load(f_path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # modification time orders entries for eviction; explicit time in ns, file system clocks are coarse
+        now = time.time_ns()
+        os.utime(f_path, ns=(now, now))
+
+        return datablock
+
+    def put(
+        self,
+        key: str,
+        f_path: Union[str, os.PathLike],
+        offset: int,
+        shape: Tuple[int, int],
+        dtype: Union[str, np.dtype],
+    ) -> Optional[np.ndarray]:
+        """ Copies the datablock of the datalog into a new entry and returns it memory-mapped.
+
+        The entry is written under a temporary name and renamed once complete, least recently used entries
+        are evicted beforehand to keep the cache within its size limit.
+
+        Args:
+            key (str): fingerprint of the datalog
+            f_path (Union[str, os.PathLike]): path to the datalog
+            offset (int): byte address of the datablock
+            shape (Tuple[int, int]): number of samples and columns of the datablock
+            dtype (Union[str, np.dtype]): data type of samples
+
+        Returns:
+            Optional[np.ndarray]: samples of shape (samples, columns), None if the datablock is empty or exceeds the cache
+        """
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if not nbytes:
+            return None
+
+        if self.max_size is not None and nbytes > self.max_size:
+            warn(f"Datablock of {f_path} with {nbytes} bytes exceeds the cache size and will not be cached.")
+            return None
+
+        self._evict(nbytes)
+
+        # unique per process, workers may cache the same datalog at once
+        partial_path = f"{self._path(key)}.{os.getpid()}.partial"
+        try:
+            datablock = np.lib.format.open_memmap(partial_path, mode="w+", dtype=dtype, shape=shape)
+            content = datablock.reshape(-1).view(np.uint8)
+
+            with open(f_path, "rb") as f_obj:
+                f_obj.seek(offset)
+                for start in range(0, nbytes, self._COPY_BLOCK_SIZE):
+                    f_obj.readinto(content[start:start + self._COPY_BLOCK_SIZE])
+
+            datablock.flush()
+            del datablock, content
+
+            os.replace(partial_path, self._path(key))
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        return self.get(key)
+
+    def _evict(
+        self,
+        nbytes: int,
+    ) -> None:
+        """ Removes least recently used entries until `nbytes` more fit into the cache.
+        """
+        if self.max_size is None:
+            return
+
+        entries = list()
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.endswith(self._EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        size = sum(item[1] for item in entries)
+        for _, entry_size, entry_path in sorted(entries):
+            if size + nbytes <= self.max_size:
+                break
+
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                # evicted by another process
+                pass
+            size -= entry_size
+
+    def _path(
+        self,
+        key: str,
+    ) -> str:
+        return os.path.join(self.folder, key + self._EXTENSION)
@@ -1,15 +1,18 @@
 import os
 import sys
+import time
 import struct
 from itertools import islice
 from datetime import datetime
+from numbers import Real
+from warnings import warn
 from collections import abc
 
 import numpy as np
 import h5py as h
 
 from epycon.core._typing import (
-    Union, List, Sequence, PathLike, ArrayLike, 
+    Union, List, Sequence, PathLike, ArrayLike, Dict, Tuple,
 )
 
 from epycon.core._validators import (
@@ -44,6 +47,8 @@ from epycon.config.byteschema import (
     GROUP_MAP, SOURCE_MAP, MASTER_FILENAME, ENTRIES_FILENAME
 )
 
+from epycon.iou.cache import SampleCache
+
 
 def _twos_complement(darray: np.array, sample_size: int):
     """ Extract negative values with the Two's complement
@@ -53,17 +58,41 @@ def _twos_complement(darray: np.array, sample_size: int):
         sample_size (int): _description_
     """
     twos_complement = 2 ** (8 * sample_size) - 1
-    darray[darray >= (twos_complement // 2 - 1)] -= twos_complement
+    mask = darray >= (twos_complement // 2 - 1)
+
+    if not mask.any():
+        return darray
+
+    # read-only (memory-mapped) arrays are copied only when there is something to fix
+    if not darray.flags.writeable:
+        darray = darray.copy()
+
+    darray[mask] -= twos_complement
 
     return darray
 
 
+def _bins(darray: np.ndarray, binsize: int) -> np.ndarray:
+    """ Reshapes samples (samples, channels) into bins (bins, binsize, channels), the last bin is padded by its edge values.
+    """
+    n_rest = len(darray) % binsize
+    if n_rest:
+        darray = np.pad(darray, ((0, binsize - n_rest), (0, 0)), mode="edge")
+
+    return darray.reshape(-1, binsize, darray.shape[1])
+
+
 class LogParser(abc.Iterator):
     """_summary_
 
     Args:
         abc (_type_): _description_
     """
+    # bytes of the datablock read at once by the overview
+    _OVERVIEW_BLOCK_SIZE = 2**24
+    # bytes between decimated samples from which they are read one by one instead of scanning
+    _OVERVIEW_SEEK_SIZE = 2**16
+
     def __init__(
         self,
         f_path: Union[str, bytes, os.PathLike],
@@ -71,6 +100,14 @@ class LogParser(abc.Iterator):
         samplesize: int = 1024,
         start: int = 0,
         end: Union[int, None] = None,
+        mmap: bool = False,
+        channels: Union[Sequence[str], None] = None,
+        dtype: Union[str, np.dtype, None] = None,
+        reuse_buffers: bool = False,
+        cache: Union[SampleCache, None] = None,
+        follow: bool = False,
+        poll_interval: float = 1.0,
+        idle_timeout: float = 60.0,
         **kwargs
         ) -> None:
         super().__init__()
@@ -89,12 +126,43 @@ class LogParser(abc.Iterator):
         self.samplesize = _validate_int("chunk size", samplesize, min_value=1024)
         self.start = _validate_int("start sample", start, min_value=0)
         self.end = _validate_int("end sample", end, min_value=start)
-            
+
+        # map the datablock into memory instead of reading it into buffers
+        self.mmap = mmap
+
+        # names of channels or leads to decode, all sample columns if not provided
+        self.channels = channels
+
+        # output data type; raw counts for int32, scaled samples for floats, legacy scaling if not provided
+        if dtype is not None:
+            dtype = np.dtype(_validate_str("dtype", np.dtype(dtype).name, valid_set={"int32", "float32", "float64"}))
+        self.dtype = dtype
+
+        # decode chunks of the iterator into persistent buffers; a chunk is valid until the next one is read
+        self.reuse_buffers = reuse_buffers
+
+        # local copies of datablocks read instead of the datalog once cached
+        self.cache = cache
+
+        # wait for samples appended to a datalog still being recorded, until it stops growing for `idle_timeout` seconds
+        self.follow = follow
+        if follow and (mmap or cache is not None):
+            raise ValueError("Follow mode reads a growing datalog and can not be combined with memory mapping or cache.")
+        for name, value in (("poll interval", poll_interval), ("idle timeout", idle_timeout)):
+            if not isinstance(value, Real) or value < 0:
+                raise ValueError(f"Parameter `{name}` expected to be a non-negative number of seconds, got {value!r} instead.")
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        
         
         # file related content required for parsing.        
         self._f_obj = None
         self._header = None
         self._stopbyte = None
+        self._n_samples = None
+        self._columns = None
+        self._datablock = None
+        self._buffers = dict()
         self._chunksize = None
         self._blocksize = None
         self._channel_mapping = None
@@ -109,6 +177,9 @@ class LogParser(abc.Iterator):
             # read and store header in advance
             self._header = self._readheader()
             
+            # resolve selected channels into sample columns to decode
+            self._columns = self._resolvecolumns(self.channels)
+
             # adjust the range of datablocks to read given as the number of active channels times bytes per sample
             self._block_size = self._header.num_channels * self.diary.sample_size 
 
@@ -125,8 +196,17 @@ class LogParser(abc.Iterator):
                 # set stop byte to the last one
                 stopbyte = float("Inf")
 
+            # number of complete samples stored in the datablock
+            self._n_samples = max(0, self._f_obj.seek(0, 2) - self._header.datablock_address) // self._block_size
+
             # get address of the last/user defined byte
-            self._stopbyte = min(stopbyte, self._f_obj.seek(0, 2))                      
+            self._stopbyte = min(stopbyte, self._header.datablock_address + self._n_samples * self._block_size)
+
+            if self.cache is not None:
+                self._datablock = self._cacheddatablock(self._n_samples)
+
+            if self.mmap and self._datablock is None:
+                self._datablock = self._mapdatablock(self._n_samples)
             
             # Seek to start position
             self._f_obj.seek(max(self._header.datablock_address, startbyte))
@@ -141,6 +221,10 @@ class LogParser(abc.Iterator):
         if self._header is not None:
             self._header = None
 
+        # Release memory mapping, views handed out before keep it alive
+        self._datablock = None
+        self._buffers = dict()
+
         # Close file object
         if self._f_obj:
             self._f_obj.close()
@@ -151,6 +235,60 @@ class LogParser(abc.Iterator):
     def __iter__(self):
         return self
 
+    def __getitem__(self, key: Union[int, slice]) -> np.ndarray:
+        """ Random access to samples of the datalog regardless of the iterator position.
+
+        Indices are absolute sample numbers counted from the beginning of the datablock, i.e.
+        independent of `start` and `end` given to the parser.
+
+        Args:
+            key (Union[int, slice]): sample index or slice with a positive step
+
+        Raises:
+            IndexError: sample index out of range
+            ValueError: non-positive slice step
+            TypeError: unsupported index type
+
+        Returns:
+            np.ndarray: single sample of shape (num_channels, ) or samples of shape (n, num_channels)
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.n_samples)
+            if step < 1:
+                raise ValueError(f"Slice step expected to be a positive integer, got {step}")
+            
+            return self._readrange(start, max(start, stop))[::step]
+
+        if isinstance(key, (int, np.integer)):
+            index = key + self.n_samples if key < 0 else key
+            if not 0 <= index < self.n_samples:
+                raise IndexError(f"Sample index {key} out of range for datalog with {self.n_samples} samples")
+            
+            return self._readrange(index, index + 1)[0]
+
+        raise TypeError(f"Datalog indices must be integers or slices, not {type(key).__name__}")
+
+    @property
+    def n_samples(self) -> int:
+        """ Number of complete samples stored in the datablock.
+        """
+        if self._n_samples is None:
+            raise ValueError(f"Datalog {self.f_path} is not open.")
+        
+        return self._n_samples
+
+    @property
+    def n_selected(self) -> int:
+        """ Number of samples between start and end sample returned by iterating over the datalog.
+        """
+        if self._n_samples is None:
+            raise ValueError(f"Datalog {self.f_path} is not open.")
+
+        startsample = min(self.start, self._n_samples)
+        stopsample = self._n_samples if self.end is None else min(self.end, self._n_samples)
+
+        return max(0, stopsample - startsample)
+
     def __next__(self) -> np.ndarray:
         """_summary_
 
@@ -160,27 +298,58 @@ class LogParser(abc.Iterator):
         Returns:
             np.ndarray: _description_
         """
-        try:
-            if self._f_obj.tell() >= self._stopbyte:
-                raise StopIteration
-            
-            chunksize = min(self._chunksize, self._stopbyte - self._f_obj.tell())                        
-            chunk = self._f_obj.read(chunksize)
+        # the datalog stays open for random access until the context manager exits
+        if self.follow and self._f_obj.tell() >= self._stopbyte:
+            self._awaitsamples()
 
-            if not chunk:
-                raise StopIteration
-            else:
-                chunk = np.frombuffer(
-                    bytearray(chunk),
-                    dtype=np.dtype(self.diary.datablock.fmt),
-                    )
-            
-        except StopIteration:
-            self.__exit__(exc_type=None, exc_value=None, exc_traceback=None)
-            raise
+        if self._f_obj.tell() >= self._stopbyte:
+            raise StopIteration
 
-        return self._process_chunk(chunk)
+        chunksize = min(self._chunksize, self._stopbyte - self._f_obj.tell())
+        chunk = self._readblock(chunksize, reuse=self.reuse_buffers)
+
+        if not chunk.size:
+            raise StopIteration
 
+        return self._process_chunk(chunk, reuse=self.reuse_buffers)
+
+
+    def _awaitsamples(self) -> None:
+        """ Polls the size of the datalog until samples from the current position are appended, the end
+        sample is reached or the datalog stops growing for the idle timeout.
+        """
+        deadline = time.monotonic() + self.idle_timeout
+
+        while self.end is None or self._n_samples < self.end:
+            if self._refresh():
+                # samples before the start do not count as idle
+                if self._f_obj.tell() < self._stopbyte:
+                    return
+                deadline = time.monotonic() + self.idle_timeout
+
+            if time.monotonic() >= deadline:
+                return
+
+            time.sleep(self.poll_interval)
+
+    def _refresh(self) -> bool:
+        """ Updates the number of complete samples from the current size of the datalog.
+
+        Returns:
+            bool: True if new samples were appended
+        """
+        size = os.fstat(self._f_obj.fileno()).st_size
+        n_samples = max(0, size - self._header.datablock_address) // self._block_size
+
+        if n_samples <= self._n_samples:
+            return False
+
+        self._n_samples = n_samples
+        # rows being written are excluded until complete
+        stopsample = n_samples if self.end is None else min(self.end, n_samples)
+        self._stopbyte = self._header.datablock_address + stopsample * self._block_size
+
+        return True
 
     def read(
         self,
@@ -191,43 +360,480 @@ class LogParser(abc.Iterator):
             np.ndarray: _description_
         """
         
-        chunk = self._f_obj.read(self._stopbyte-self._f_obj.tell())
+        chunk = self._readblock(self._stopbyte-self._f_obj.tell())
 
-        if not chunk:
+        if not chunk.size:
             return None
+            
+        return self._process_chunk(chunk)
+
+    def read_window(
+        self,
+        start: Union[float, datetime, None] = None,
+        stop: Union[float, datetime, None] = None,
+    ) -> np.ndarray:
+        """ Reads samples within a time window regardless of the iterator position.
+
+        Args:
+            start (Union[float, datetime, None], optional): seconds from the beginning of the recording or absolute time. Defaults to the beginning.
+            stop (Union[float, datetime, None], optional): seconds from the beginning of the recording or absolute time. Defaults to the end.
+
+        Returns:
+            np.ndarray: samples of shape (n, num_channels)
+        """
+        startsample = 0 if start is None else self._tosample(start)
+        stopsample = self.n_samples if stop is None else self._tosample(stop)
+
+        return self[startsample:stopsample]
+
+    def read_overview(
+        self,
+        n_points: int,
+        channels: Union[Sequence[str], None] = None,
+        start: Union[float, datetime, None] = None,
+        stop: Union[float, datetime, None] = None,
+        method: str = "minmax",
+    ) -> np.ndarray:
+        """ Reduces samples within a time window into at most `n_points` bins, e.g. to draw a thumbnail of the datalog.
+
+        The datablock is scanned in large sequential blocks regardless of the iterator position, raw counts of each
+        block are reduced into bins and only the reduced values are scaled into the output data type. Bins hold
+        the same number of samples, except for the last one.
+
+        Args:
+            n_points (int): maximum number of bins
+            channels (Union[Sequence[str], None], optional): names of raw channels or WorkMate defined leads. Defaults to channels selected by the parser, or all sample columns.
+            start (Union[float, datetime, None], optional): seconds from the beginning of the recording or absolute time. Defaults to the beginning.
+            stop (Union[float, datetime, None], optional): seconds from the beginning of the recording or absolute time. Defaults to the end.
+            method (str, optional): "minmax" for minimum and maximum of each bin, "decimate" for the first sample of each bin. Defaults to "minmax".
+
+        Raises:
+            ValueError: unknown method or channel
+
+        Returns:
+            np.ndarray: minima and maxima of shape (bins, channels, 2) or decimated samples of shape (bins, channels)
+        """
+        n_points = _validate_int("number of points", n_points, min_value=1)
+        method = _validate_str("overview method", method, valid_set={"minmax", "decimate"})
+
+        mappings = self._overviewmappings(channels)
+
+        # decode only sample columns referenced by the leads, mount points to their positions
+        columns = sorted({column for source in mappings.values() for column in source})
+        position = {column: idx for idx, column in enumerate(columns)}
+        mount = Mount({
+            name: {position[column]: weight for column, weight in source.items()}
+            if isinstance(source, dict)
+            else tuple(position[column] for column in source)
+            for name, source in mappings.items()
+            })
+        columns = np.array(columns, dtype=np.intp)
+
+        startsample = 0 if start is None else self._tosample(start)
+        stopsample = self.n_samples if stop is None else self._tosample(stop)
+        n_samples = max(0, stopsample - startsample)
+
+        binsize = max(1, -(-n_samples // n_points))
+        n_bins = -(-n_samples // binsize)
+        shape = (n_bins, len(mount), 2) if method == "minmax" else (n_bins, len(mount))
+
+        if not n_bins:
+            return self._scale(np.empty(shape, dtype=mount.result_dtype(np.dtype(self.diary.datablock.fmt))))
+
+        # blocks of whole bins, or pieces of a single bin if it exceeds the block
+        blocksize = max(1, self._OVERVIEW_BLOCK_SIZE // self._block_size)
+        if binsize <= blocksize:
+            blocksize = blocksize // binsize * binsize
+        else:
+            blocksize = -(-binsize // -(-binsize // blocksize))
+
+        # bins are visited one by one if they exceed the block or only their first samples are read
+        sparse = binsize > blocksize or (method == "decimate" and binsize * self._block_size >= self._OVERVIEW_SEEK_SIZE)
+
+        out = None
+        position = self._f_obj.tell()
+        # raw bytes of a block, independent of persistent buffers of the iterator
+        buffer = np.empty(min(blocksize, n_samples) * self._block_size, dtype=np.uint8) if self._datablock is None else None
+
+        try:
+            for first in range(startsample, stopsample, binsize if sparse else blocksize):
+                last = min(first + max(binsize, blocksize), stopsample)
+                idx = (first - startsample) // binsize
+
+                if method == "decimate":
+                    # first sample of each bin only
+                    samples = self._overviewblock(first, first + 1 if sparse else last, columns, mount, buffer, step=binsize)
+                else:
+                    # running minima and maxima of the pieces of bins
+                    samples = None
+                    for piece in range(first, last, blocksize):
+                        block = self._overviewblock(piece, min(piece + blocksize, last), columns, mount, buffer)
+                        # a piece is a part of a single bin if bins exceed the block
+                        block = _bins(block, min(binsize, len(block)))
+                        block = np.stack((block.min(axis=1), block.max(axis=1)), axis=-1)
+
+                        if samples is None:
+                            samples = block
+                        else:
+                            np.minimum(samples[..., 0], block[..., 0], out=samples[..., 0])
+                            np.maximum(samples[..., 1], block[..., 1], out=samples[..., 1])
+
+                if out is None:
+                    out = np.empty(shape, dtype=samples.dtype)
+                out[idx:idx + len(samples)] = samples
+        finally:
+            self._f_obj.seek(position)
+
+        return self._scale(out)
+
+    def _overviewmappings(
+        self,
+        channels: Union[Sequence[str], None],
+    ) -> Dict[str, Union[Tuple[int], Dict[int, float]]]:
+        """ Returns mappings of overview channels to sample columns of the datablock.
+        """
+        channels = channels or self.channels
+
+        if not channels:
+            # all sample columns of the datablock
+            names = self._header.channels.column_names(self._header.num_channels)
+            return {name: (column, ) for column, name in enumerate(names)}
+
+        mappings = {
+            **self._header.channels.computed_mappings,
+            **self._header.channels.raw_mappings,
+            }
+
+        missing = [name for name in channels if name not in mappings]
+        if missing:
+            raise ValueError(f"Channels {missing} not found in datalog {self.f_path}.")
+
+        return {name: mappings[name] for name in channels}
+
+    def _overviewblock(
+        self,
+        startsample: int,
+        stopsample: int,
+        columns: np.ndarray,
+        mount: "Mount",
+        buffer: Union[np.ndarray, None],
+        step: int = 1,
+    ) -> np.ndarray:
+        """ Reads raw counts of every `step`-th sample of a range and computes leads of the mount, the file position is moved.
+        """
+        if self._datablock is None:
+            self._f_obj.seek(self._header.datablock_address + startsample * self._block_size)
+            nbytes = self._f_obj.readinto(buffer[:(stopsample - startsample) * self._block_size])
+            chunk = buffer[:nbytes].view(np.dtype(self.diary.datablock.fmt)).reshape((-1, self._header.num_channels))
         else:
-            chunk = np.frombuffer(
-                bytearray(chunk),
-                dtype=np.dtype(self.diary.datablock.fmt),
+            chunk = self._datablock[startsample:stopsample]
+
+        chunk = np.take(chunk[::step], columns, axis=1)
+
+        return mount(_twos_complement(chunk, self.diary.sample_size))
+
+    def _tosample(
+        self,
+        moment: Union[float, datetime],
+    ) -> int:
+        """ Converts time into the nearest sample index.
+
+        Args:
+            moment (Union[float, datetime]): seconds from the beginning of the recording or absolute time
+
+        Returns:
+            int: sample index clipped to the datablock range
+        """
+        if isinstance(moment, datetime):
+            seconds = moment.timestamp() - self._header.timestamp
+        elif isinstance(moment, Real):
+            seconds = moment
+        else:
+            raise TypeError(f"Expected time in seconds or datetime, got {type(moment).__name__}")
+        
+        sample = int(round(seconds * self._header.amp.sampling_freq))
+
+        return min(max(sample, 0), self.n_samples)
+
+    def _readrange(
+        self,
+        startsample: int,
+        stopsample: int,
+    ) -> np.ndarray:
+        """ Reads and processes a range of samples, the iterator position is preserved.
+
+        Args:
+            startsample (int): first sample to read
+            stopsample (int): sample to stop at (exclusive)
+
+        Returns:
+            np.ndarray: samples of shape (stopsample - startsample, num_channels)
+        """
+        position = self._f_obj.tell()
+        
+        try:
+            self._f_obj.seek(self._header.datablock_address + startsample * self._block_size)
+            chunk = self._readblock((stopsample - startsample) * self._block_size)
+        finally:
+            self._f_obj.seek(position)
+
+        return self._process_chunk(chunk)
+
+    def _mapdatablock(
+        self,
+        n_samples: int,
+    ) -> np.ndarray:
+        """ Maps the datablock of the datalog into memory.
+
+        Args:
+            n_samples (int): number of complete samples stored in the datablock
+
+        Returns:
+            np.ndarray: read-only (n_samples, num_channels) view of the raw datablock
+        """
+        shape = (n_samples, self._header.num_channels)
+        dtype = np.dtype(self.diary.datablock.fmt)
+
+        if not n_samples:
+            # empty files cannot be mapped
+            return np.empty(shape, dtype=dtype)
+
+        return np.memmap(
+            self.f_path,
+            dtype=dtype,
+            mode="r",
+            offset=self._header.datablock_address,
+            shape=shape,
+            )
+
+    def _cacheddatablock(
+        self,
+        n_samples: int,
+    ) -> Union[np.ndarray, None]:
+        """ Returns the datablock from the cache, copied into the cache first if missing.
+
+        Args:
+            n_samples (int): number of complete samples stored in the datablock
+
+        Returns:
+            Union[np.ndarray, None]: read-only (n_samples, num_channels) view of the cached datablock, None if not cacheable
+        """
+        key = self.cache.fingerprint(self.f_path, self._header.datablock_address, salt=self.diary.__name__)
+
+        datablock = self.cache.get(key)
+        if datablock is None:
+            datablock = self.cache.put(
+                key,
+                self.f_path,
+                self._header.datablock_address,
+                (n_samples, self._header.num_channels),
+                np.dtype(self.diary.datablock.fmt),
                 )
+
+        return datablock
+
+    def _allocate(
+        self,
+        key: str,
+        shape: Tuple[int],
+        dtype: np.dtype,
+        reuse: bool = False,
+    ) -> np.ndarray:
+        """ Returns an uninitialized array, taken from the persistent buffers if requested.
+
+        Args:
+            key (str): name of the persistent buffer
+            shape (Tuple[int]): shape of the array
+            dtype (np.dtype): data type of the array
+            reuse (bool, optional): reuse the persistent buffer. Defaults to False.
+
+        Returns:
+            np.ndarray: new array or leading rows of the persistent buffer
+        """
+        if not reuse:
+            return np.empty(shape, dtype=dtype)
+
+        buffer = self._buffers.get(key)
+        if (
+            buffer is None
+            or buffer.dtype != dtype
+            or buffer.shape[1:] != tuple(shape[1:])
+            or len(buffer) < shape[0]
+            ):
+            buffer = self._buffers[key] = np.empty(shape, dtype=dtype)
+
+        return buffer[:shape[0]]
+
+    def _readblock(
+        self,
+        nbytes: int,
+        reuse: bool = False,
+    ) -> np.ndarray:
+        """ Reads raw samples from the current position and moves the position forward.
+
+        Args:
+            nbytes (int): number of bytes to read
+            reuse (bool, optional): read into the persistent byte buffer. Defaults to False.
+
+        Returns:
+            np.ndarray: raw samples, a view into the page cache in mmap mode
+        """
+        if self._datablock is None:
+            if not reuse:
+                return np.frombuffer(
+                    bytearray(self._f_obj.read(nbytes)),
+                    dtype=np.dtype(self.diary.datablock.fmt),
+                    )
             
-        return self._process_chunk(chunk)
+            buffer = self._allocate("bytes", (nbytes,), np.uint8, reuse=True)
+            nbytes = self._f_obj.readinto(buffer)
+
+            return buffer[:nbytes].view(np.dtype(self.diary.datablock.fmt))
+
+        startrow = (self._f_obj.tell() - self._header.datablock_address) // self._block_size
+        stoprow = startrow + nbytes // self._block_size
+
+        self._f_obj.seek(nbytes, 1)
+
+        return self._datablock[startrow:stoprow]
             
 
     def _process_chunk(
         self,
         chunk: np.ndarray,
+        reuse: bool = False,
         ) -> np.ndarray:
-        """_summary_
+        """ Decodes raw samples into the output array.
 
         Args:
-            byte_chunk (_type_): _description_
+            chunk (np.ndarray): raw samples
+            reuse (bool, optional): decode into persistent buffers. Defaults to False.
 
         Returns:
-            _type_: _description_
+            np.ndarray: samples of shape (n, num_channels) or (n, len(columns))
         """
+        # Reshape array
+        chunk = chunk.reshape((-1, self._header.num_channels))
+
+        # Keep selected sample columns only, a strided view if the columns are adjacent
+        if self._columns is not None:
+            if self._columns == tuple(range(self._columns[0], self._columns[-1] + 1)):
+                chunk = chunk[:, self._columns[0]:self._columns[-1] + 1]
+            else:
+                chunk = np.take(
+                    chunk,
+                    self._columns,
+                    axis=1,
+                    out=self._allocate("columns", (len(chunk), len(self._columns)), chunk.dtype, reuse),
+                    mode="clip",
+                    )
+
         chunk = _twos_complement(chunk, self.diary.sample_size)
 
-        # Multiply signal by resolution to get correct physical units.
-        chunk = chunk * self._header.amp.resolution
+        return self._scale(chunk, reuse=reuse)
 
-        # Reshape array
-        return chunk.reshape(
-            (
-                len(chunk) // self._header.num_channels,
-                self._header.num_channels,
+    def _scale(
+        self,
+        chunk: np.ndarray,
+        reuse: bool = False,
+        ) -> np.ndarray:
+        """ Converts raw counts into the output data type.
+
+        Args:
+            chunk (np.ndarray): raw counts
+            reuse (bool, optional): scale into persistent buffers. Defaults to False.
+
+        Returns:
+            np.ndarray: samples of the same shape
+        """
+        if self.dtype is None:
+            # Multiply signal by resolution to get correct physical units.
+            return np.multiply(
+                chunk,
+                self._header.amp.resolution,
+                out=self._allocate("samples", chunk.shape, np.result_type(chunk, self._header.amp.resolution), reuse),
                 )
-            )        
+
+        if self.dtype.kind == "i":
+            # raw counts, scaling is left to the consumer
+            return chunk
+
+        # cast and scale in a single pass
+        return np.multiply(
+            chunk,
+            self._header.amp.resolution,
+            out=self._allocate("samples", chunk.shape, self.dtype, reuse),
+            dtype=self.dtype,
+            casting="unsafe",
+            )
+
+    def _resolvecolumns(
+        self,
+        channels: Union[Sequence[str], None],
+    ) -> Union[Tuple[int], None]:
+        """ Resolves channel or lead names into sample columns of the datablock.
+
+        Args:
+            channels (Union[Sequence[str], None]): names of raw channels or WorkMate defined leads
+
+        Returns:
+            Union[Tuple[int], None]: sorted sample columns, None if all columns are decoded
+        """
+        if not channels:
+            return None
+
+        mappings = {
+            **self._header.channels.computed_mappings,
+            **self._header.channels.raw_mappings,
+            }
+
+        columns = set()
+        for name in channels:
+            if name not in mappings:
+                warn(f"Channel `{name}` not found in datalog {self.f_path} and will be skipped.")
+                continue
+            columns.update(mappings[name])
+
+        if not columns:
+            raise ValueError(f"None of the selected channels found in datalog {self.f_path}.")
+
+        return tuple(sorted(columns))
+
+    def remap(
+        self,
+        mappings: Dict[str, Union[Tuple[int], Dict[int, float]]],
+    ) -> Dict[str, Union[Tuple[int], Dict[int, float]]]:
+        """ Translates sample columns in channel mappings into columns of the decoded chunks.
+
+        Args:
+            mappings (Dict[str, Union[Tuple[int], Dict[int, float]]]): mapping of channel names to sample columns of the datablock or to their weights
+
+        Raises:
+            ValueError: mapping refers to a sample column that is not decoded
+
+        Returns:
+            Dict[str, Union[Tuple[int], Dict[int, float]]]: mapping of channel names to columns of the chunks returned by the parser
+        """
+        if self._columns is None:
+            return mappings
+
+        position = {column: idx for idx, column in enumerate(self._columns)}
+
+        try:
+            return {
+                key: {position[column]: weight for column, weight in source.items()}
+                if isinstance(source, dict)
+                else tuple(position[column] for column in source)
+                for key, source in mappings.items()
+                }
+        except KeyError as e:
+            raise ValueError(f"Sample column {e} is not decoded. Add the channel into the `channels` selection.")
+
+    @property
+    def columns(self) -> Union[Tuple[int], None]:
+        """ Sample columns of the datablock returned by the parser, None if all columns are returned.
+        """
+        return self._columns
 
 
     def _readheader(self) -> Header:
@@ -378,17 +984,160 @@ class LogParser(abc.Iterator):
         return self._header
 
 
-def _mount_channels(darray, mappings):
-    result = np.empty((len(mappings), darray.shape[0]), dtype=darray.dtype)
+class Mount:
+    """ Electrode mount compiled into column indices of the data chunk.
 
-    # Iterate through the tuples, performing the selection/summation    
-    for t, source in enumerate(mappings.values()):
-        if len(source) == 1:
-            result[t] = darray[:, source[0]]
-        else:            
-            result[t] = darray[:, source[0]] - darray[:, source[1]]
-        
-    return result.transpose()
+    Unipolar and bipolar leads are computed at once by gathering the positive and negative sources and subtracting
+    them, instead of looping over leads for every chunk. If any lead is a weighted sum of sources, e.g. Wilson central
+    terminal or average reference, the whole mount is compiled into a mixing matrix applied as a single matrix product.
+
+    Args:
+        mappings (Dict[str, Union[Tuple[int], Dict[int, float]]]): mapping of lead names to one (unipolar) or two (bipolar) columns of the chunk, or to weights of the columns
+    """
+    _BLOCK_SIZE = 65536
+
+    def __init__(
+        self,
+        mappings: Dict[str, Union[Tuple[int], Dict[int, float]]],
+        ) -> None:
+
+        for key, source in mappings.items():
+            if not isinstance(source, dict) and len(source) not in (1, 2):
+                raise ValueError(f"Lead `{key}` expected to have 1 or 2 electrical sources, got {len(source)}")
+            if not len(source):
+                raise ValueError(f"Lead `{key}` has no electrical source")
+
+        self.names = list(mappings.keys())
+        self._maxidx = max((column for source in mappings.values() for column in source), default=-1)
+
+        if any(isinstance(source, dict) for source in mappings.values()):
+            self._compile_mixing(mappings)
+        else:
+            self._compile_indices(mappings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _compile_indices(
+        self,
+        mappings: Dict[str, Tuple[int]],
+        ) -> None:
+        self._mixing = None
+
+        # positive source of every lead, negative source of bipolar leads only
+        self._posidx = np.array([source[0] for source in mappings.values()], dtype=np.intp)
+        self._negidx = np.array([source[1] for source in mappings.values() if len(source) == 2], dtype=np.intp)
+
+        # runs of adjacent bipolar leads as (first lead, last lead + 1, offset in negative sources)
+        self._runs = list()
+        offset = 0
+        for t, source in enumerate(mappings.values()):
+            if len(source) != 2:
+                continue
+            if self._runs and self._runs[-1][1] == t:
+                self._runs[-1][1] += 1
+            else:
+                self._runs.append([t, t + 1, offset])
+            offset += 1
+
+    def _compile_mixing(
+        self,
+        mappings: Dict[str, Union[Tuple[int], Dict[int, float]]],
+        ) -> None:
+        # mixing matrix is restricted to the columns referenced by the leads
+        columns = sorted({column for source in mappings.values() for column in source})
+        position = {column: idx for idx, column in enumerate(columns)}
+
+        mixing = np.zeros((len(columns), len(mappings)), dtype=np.float64)
+        for t, source in enumerate(mappings.values()):
+            if isinstance(source, dict):
+                for column, weight in source.items():
+                    mixing[position[column], t] += weight
+            else:
+                mixing[position[source[0]], t] += 1.0
+                if len(source) == 2:
+                    mixing[position[source[1]], t] -= 1.0
+
+        self._columns = np.array(columns, dtype=np.intp)
+        self._mixing = {
+            np.dtype(np.float64): mixing,
+            np.dtype(np.float32): mixing.astype(np.float32),
+            }
+
+    def result_dtype(
+        self,
+        dtype: np.dtype,
+        ) -> np.dtype:
+        """ Data type of leads computed from a chunk of the given data type.
+
+        Args:
+            dtype (np.dtype): data type of the chunk
+
+        Returns:
+            np.dtype: data type of the leads, floating point if the mount has weighted leads
+        """
+        if self._mixing is None:
+            return np.dtype(dtype)
+
+        return np.promote_types(dtype, np.float32)
+
+    def __call__(
+        self,
+        darray: np.ndarray,
+        out: Union[np.ndarray, None] = None,
+        ) -> np.ndarray:
+        """ Computes leads from the data chunk.
+
+        Args:
+            darray (np.ndarray): data chunk of shape (samples, columns)
+            out (Union[np.ndarray, None], optional): C-contiguous buffer of shape (samples, leads) and data type given by `result_dtype`. Defaults to None.
+
+        Raises:
+            IndexError: mount refers to a column outside of the data chunk
+            ValueError: data type of `out` differs from `result_dtype`
+
+        Returns:
+            np.ndarray: leads of shape (samples, leads)
+        """
+        if self._maxidx >= darray.shape[1]:
+            raise IndexError(f"Electrical source {self._maxidx} out of bounds for chunk with {darray.shape[1]} columns")
+
+        dtype = self.result_dtype(darray.dtype)
+        if out is None:
+            out = np.empty((darray.shape[0], len(self)), dtype=dtype)
+        elif out.dtype != dtype:
+            raise ValueError(f"Output buffer expected to be of {dtype} data type for {darray.dtype} chunks, got {out.dtype} instead.")
+
+        if self._mixing is not None:
+            mixing = self._mixing[out.dtype]
+
+            # blocks of samples keep the floating point copy of the sources small
+            for idx in range(0, darray.shape[0], self._BLOCK_SIZE):
+                rows = slice(idx, idx + self._BLOCK_SIZE)
+                sources = np.take(darray[rows], self._columns, axis=1).astype(out.dtype, copy=False)
+                np.matmul(sources, mixing, out=out[rows])
+
+            return out
+
+        np.take(darray, self._posidx, axis=1, out=out, mode="clip")
+
+        if not self._runs:
+            return out
+
+        # subtract negative sources run by run, slices avoid costly fancy-indexed assignment;
+        # blocks of samples keep the gathered sources small
+        for idx in range(0, darray.shape[0], self._BLOCK_SIZE):
+            rows = slice(idx, idx + self._BLOCK_SIZE)
+            negative = np.take(darray[rows], self._negidx, axis=1)
+
+            for first, last, offset in self._runs:
+                out[rows, first:last] -= negative[:, offset:offset + last - first]
+
+        return out
+
+
+def _mount_channels(darray, mappings, out=None):
+    return Mount(mappings)(darray, out=out)
 
 
 @checktypes
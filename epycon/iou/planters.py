@@ -1,15 +1,33 @@
 import os
+import zlib
+import struct
+import threading
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 import h5py as h
 import numpy as np
 from dataclasses import fields
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
 
 from epycon.iou.constants import HDFConfig
 from epycon.utils.decorators import checktypes
 
 from epycon.core._dataclasses import Entry
-from epycon.core._formatting import _tocsv, _tosel, SignalPlantDefaults
+from epycon.core._formatting import _tocsv, _tosel, _tocsvrows, SignalPlantDefaults
+from epycon.core.helpers import pretty_json
 
 from epycon.core._typing import (
     Union, PathLike, NumpyArray, Tuple, List, Any,
@@ -115,6 +133,44 @@ class EntryPlanter:
                     yield item
 
 
+def _extension(f_path: Union[str, bytes, os.PathLike]) -> str:
+    """ Returns lower-case file extension including the suffix of compressed files, e.g. `.csv.gz`.
+    """
+    root, extension = os.path.splitext(os.fsdecode(f_path))
+    extension = extension.lower()
+
+    if extension in {".gz", ".zst"}:
+        extension = os.path.splitext(root)[1].lower() + extension
+
+    return extension
+
+
+def _edfnumber(value: Union[int, float]) -> str:
+    """ Formats a number into at most 8 characters of an EDF header field.
+    """
+    if float(value).is_integer():
+        return str(int(value))
+
+    for decimals in range(6, -1, -1):
+        text = f"{value:.{decimals}f}".rstrip("0").rstrip(".")
+        if len(text) <= 8:
+            return text
+
+    raise ValueError(f"Value {value} does not fit into EDF header field.")
+
+
+def _edfonset(seconds: float) -> bytes:
+    """ Formats onset of an EDF+ annotation in seconds with microsecond precision.
+    """
+    return f"{seconds:.6f}".rstrip("0").rstrip(".").encode("ascii")
+
+
+def _edffield(value: str, width: int) -> bytes:
+    """ Left-aligns ASCII text into an EDF header field of given width.
+    """
+    return value.encode("ascii", "replace")[:width].ljust(width)
+
+
 class DatalogPlanter:
     def __init__(
         self,
@@ -125,7 +181,7 @@ class DatalogPlanter:
         
         self.f_path = f_path
         self._f_obj = None
-        self._extension = _validate_str("output file extension", os.path.splitext(f_path)[1].lower(), valid_set={".csv", ".h5"})
+        self._extension = _validate_str("output file extension", _extension(f_path), valid_set={".csv", ".csv.gz", ".csv.zst", ".h5", ".npy", ".arrow", ".parquet", ".edf"})
         self.column_names = column_names
 
     def __enter__(self):
@@ -146,8 +202,30 @@ class DatalogPlanter:
     def write(self):
         raise NotImplementedError
 
+    def flush(self) -> None:
+        """ Writes buffered content into the file, e.g. to keep it up to date while samples are still appended.
+        """
+        if self._f_obj:
+            self._f_obj.flush()
+
 
 class CSVPlanter(DatalogPlanter):
+    """ Writes samples as csv rows, integers if no precision is given.
+
+    Chunks are formatted in blocks of rows by vectorized number-to-text conversion and written as bytes,
+    so memory stays bounded regardless of the chunk size. Files with `.csv.gz` or `.csv.zst` extension are
+    compressed in independent blocks (gzip members or zstd frames) by a pool of threads while the next
+    chunks are formatted; the concatenated blocks form a regular compressed file.
+    """
+
+    # number of values formatted at once
+    _BLOCK_VALUES = 65536
+    # size of uncompressed blocks compressed independently
+    _COMPRESS_BLOCK_SIZE = 4 * 2**20
+    # default compression levels
+    _GZIP_LEVEL = 6
+    _ZSTD_LEVEL = 3
+
     def __init__(
         self,
         f_path: Union[str, bytes, os.PathLike],
@@ -157,27 +235,71 @@ class CSVPlanter(DatalogPlanter):
 
         super().__init__(f_path, column_names)        
 
-        self._delimiter = kwargs.pop("delimiter", ",")
+        self.delimiter = kwargs.pop("delimiter", ",")
+        if not isinstance(self.delimiter, str) or len(self.delimiter) != 1 or not self.delimiter.isascii():
+            raise ValueError(f"Parameter `delimiter` expected to be a single ASCII character, got {self.delimiter!r} instead.")
+
+        # number of decimals, values truncated into integers if not provided
+        self.precision = _validate_int("precision", kwargs.pop("precision", None), min_value=0, mxn_value=9)
+
+        # compression given by the file extension
+        self.compression = {".csv.gz": "gzip", ".csv.zst": "zstd"}.get(self._extension)
+        if self.compression == "zstd" and zstandard is None:
+            raise ImportError("Output into .csv.zst requires the optional `zstandard` package.")
+
+        if self.compression == "gzip":
+            self.compression_level = _validate_int("compression level", kwargs.pop("compression_level", None), min_value=0, mxn_value=9)
+        else:
+            self.compression_level = _validate_int("compression level", kwargs.pop("compression_level", None), min_value=1, mxn_value=22)
+
+        # number of compressing threads, all CPUs if not provided
+        threads = kwargs.pop("threads", None)
+        self.threads = _validate_int("number of threads", threads, min_value=1) if threads is not None else (os.cpu_count() or 1)
+
         self._header_isstored = False
-        self._fmt = None
+        self._executor = None
+        self._local = None
+        self._pending = list()
+        self._pending_size = 0
+        self._futures = deque()
 
     def __enter__(self):
         try:            
-            self._f_obj = open(self.f_path, "w")
+            self._f_obj = open(self.f_path, "wb")
         except IOError as e:
             raise IOError(e)
+
+        if self.compression is not None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads)
+            # compressor contexts are not thread-safe, each thread keeps its own
+            self._local = threading.local()
+
         return self
 
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            if self._executor is not None:
+                if exc_type is None:
+                    # compress the last block and write all blocks in flight
+                    self._submit()
+                    self._drain(0)
+
+                self._executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            self._executor = None
+            self._pending, self._pending_size = list(), 0
+            self._futures.clear()
+            super().__exit__(exc_type, exc_value, exc_traceback)
+
     def write(
         self,
         darray: NumpyArray,        
         **kwargs,
         ) -> None:
-        """_summary_
+        """ Appends samples to the csv file, the header with column names is written with the first chunk.
 
         Args:
-            darray (NumpyArray): _description_
-            column_names (Union[list, tuple, None], optional): _description_. Defaults to None.
+            darray (NumpyArray): samples of shape (samples, channels)
         """
 
         # write header
@@ -188,17 +310,716 @@ class CSVPlanter(DatalogPlanter):
             else:
                 assert len(self.column_names) == darray.shape[1]
             
-            self._f_obj.writelines(self.delimiter.join(self.column_names) + '\n')
+            self._emit((self.delimiter.join(self.column_names) + '\n').encode('UTF-8'))
             self._header_isstored = True
 
-        # create csv formatting
-        if self._fmt is None:
-            string_fmt = kwargs.pop("delimiter", "%d")
-            self._fmt = self.delimiter.join([string_fmt]*darray.shape[1])
+        # write data in blocks of rows
+        rows = max(1, self._BLOCK_VALUES // max(1, darray.shape[1]))
+        for idx in range(0, darray.shape[0], rows):
+            self._emit(_tocsvrows(darray[idx:idx + rows], self.delimiter, self.precision))
+
+    def flush(self) -> None:
+        """ Writes formatted rows into the file, pending rows are compressed into a block first.
+        """
+        if self._executor is not None:
+            self._submit()
+            self._drain(0)
+
+        super().flush()
+
+    def _emit(self, content: bytes) -> None:
+        """ Writes formatted rows, or collects them into a block for compression.
+        """
+        if self._executor is None:
+            self._f_obj.write(content)
+            return
+
+        self._pending.append(content)
+        self._pending_size += len(content)
+
+        if self._pending_size >= self._COMPRESS_BLOCK_SIZE:
+            self._submit()
+
+    def _submit(self) -> None:
+        """ Compresses the collected block in the thread pool, keeps at most two blocks per thread in flight.
+        """
+        if not self._pending:
+            return
+
+        block = b''.join(self._pending)
+        self._pending, self._pending_size = list(), 0
+
+        self._futures.append(self._executor.submit(self._compress, block))
+        self._drain(2 * self.threads)
+
+    def _drain(self, limit: int) -> None:
+        """ Writes compressed blocks in order until at most `limit` blocks are in flight.
+        """
+        while len(self._futures) > limit:
+            self._f_obj.write(self._futures.popleft().result())
+
+    def _compress(self, block: bytes) -> bytes:
+        """ Compresses a block into a standalone gzip member or zstd frame.
+        """
+        if self.compression == "gzip":
+            level = self.compression_level if self.compression_level is not None else self._GZIP_LEVEL
+            # window bits of 31 write gzip header and trailer
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            return compressor.compress(block) + compressor.flush()
+
+        if not hasattr(self._local, "compressor"):
+            level = self.compression_level if self.compression_level is not None else self._ZSTD_LEVEL
+            self._local.compressor = zstandard.ZstdCompressor(level=level)
+
+        return self._local.compressor.compress(block)
+
+
+class NPYPlanter(DatalogPlanter):
+    """ Writes samples as they come into a .npy file, with a JSON sidecar of metadata and entries.
+
+    The .npy header has a fixed size and is written once, samples are streamed without any conversion.
+    Samples major files (samples, channels) are appended and their shape is patched on close if the length
+    was not known in advance. Channels major files (channels, samples) require the expected length and are
+    filled through a memory map. Both open instantly by `np.load(f_path, mmap_mode="r")`.
+    """
+
+    # size of the .npy preamble and header, fixed to patch the shape in place
+    _HEADER_SIZE = 128
+    _MAGIC = b'\x93NUMPY\x01\x00'
+    # data type of empty files
+    _EMPTY_DTYPE = '<i4'
+
+    def __init__(
+        self,
+        f_path: Union[str, bytes, os.PathLike],
+        column_names: Union[List, Tuple, None] = None,
+        **kwargs,
+    ):
+
+        super().__init__(f_path, column_names)
+
+        self.sampling_freq = kwargs.pop("sampling_freq", 1)
+        self.units = kwargs.pop("units", "uV")
+        self.factor = kwargs.pop("factor", 1000)
+        self.resolution = kwargs.pop("resolution", 1)
+
+        # additional JSON serializable content of the sidecar, e.g. header fields
+        self.metadata = kwargs.pop("metadata", None) or dict()
+
+        # expected number of samples
+        length = kwargs.pop("length", None)
+        self.length = _validate_int("expected length", length, min_value=0) if length is not None else None
+
+        self.layout = _validate_str("NPY layout", kwargs.pop("layout", "samples_major"), valid_set={"channels_major", "samples_major"})
+        if self.layout == "channels_major" and self.length is None:
+            raise ValueError("Channels major NPY layout requires the expected length.")
+
+        self.sidecar_path = os.path.splitext(os.fsdecode(f_path))[0] + ".json"
+
+        self._dtype = None
+        self._n_columns = None
+        self._offset = 0
+        self._datablock = None
+        self._marks = list()
+
+    def __enter__(self):
+        try:
+            self._f_obj = open(self.f_path, "wb+")
+        except IOError as e:
+            raise IOError(e)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            if self._f_obj and exc_type is None:
+                self._finalize()
+        finally:
+            # release memory map before the file is closed
+            self._datablock = None
+            super().__exit__(exc_type, exc_value, exc_traceback)
+
+    def write(
+        self,
+        darray: NumpyArray,
+        **kwargs,
+        ) -> None:
+        """ Appends samples of shape (samples, channels), the data type is given by the first chunk.
+
+        Args:
+            darray (NumpyArray): samples of shape (samples, channels)
+
+        Raises:
+            ValueError: inconsistent number of channels or more samples than expected in channels major layout
+        """
+        if self._dtype is None:
+            self._allocate(darray.dtype, darray.shape[1])
+
+        if darray.shape[1] != self._n_columns:
+            raise ValueError(f"Inconsistent shape of the input data. Expected {self._n_columns} channels, got {darray.shape[1]} instead.")
+
+        stop = self._offset + darray.shape[0]
+
+        if self.layout == "samples_major":
+            self._f_obj.write(np.ascontiguousarray(darray, dtype=self._dtype))
+        else:
+            if stop > self.length:
+                raise ValueError(f"Expected {self.length} samples, got at least {stop} instead.")
+
+            self._datablock[:, self._offset:stop] = darray.T
+
+        self._offset = stop
+
+    def add_marks(
+        self,
+        positions: Union[List, Tuple],
+        groups: Union[List, Tuple],
+        messages: Union[List, Tuple],
+        ) -> None:
+        """ Stores entries into the sidecar.
+
+        Args:
+            positions (Union[List, Tuple]): sample positions of entries
+            groups (Union[List, Tuple]): groups of entries
+            messages (Union[List, Tuple]): text of entries
+        """
+        self._marks = [
+            {"position": int(position), "group": group, "message": message}
+            for position, group, message in zip(positions, groups, messages)
+            ]
+
+    def _allocate(
+        self,
+        dtype: np.dtype,
+        n_columns: int,
+        ) -> None:
+        """ Writes the .npy header and reserves channels major samples.
+        """
+        if self.column_names is None:
+            # create arbitrary column names if not provided
+            self.column_names = [str(i) for i in range(n_columns)]
+        else:
+            assert len(self.column_names) == n_columns
+
+        self._dtype = np.dtype(dtype)
+        self._n_columns = n_columns
+        self._write_header(self.length if self.length is not None else 0)
+
+        if self.layout == "channels_major":
+            nbytes = n_columns * self.length * self._dtype.itemsize
+            self._f_obj.truncate(self._HEADER_SIZE + nbytes)
+            self._f_obj.flush()
+
+            if nbytes:
+                self._datablock = np.memmap(self._f_obj, dtype=self._dtype, mode="r+", offset=self._HEADER_SIZE, shape=self._shape(self.length))
+
+    def _shape(self, n_samples: int) -> Tuple[int, int]:
+        """ Returns shape of the array stored in the file.
+        """
+        if self.layout == "samples_major":
+            return (n_samples, self._n_columns)
+        return (self._n_columns, n_samples)
+
+    def _write_header(self, n_samples: int) -> None:
+        """ Writes .npy version 1.0 preamble and header padded to `_HEADER_SIZE` bytes.
+        """
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(self._dtype),
+            'fortran_order': False,
+            'shape': self._shape(n_samples),
+            }).encode('latin1')
+
+        size = self._HEADER_SIZE - len(self._MAGIC) - 2
+        header = header.ljust(size - 1) + b'\n'
+        if len(header) > size:
+            raise ValueError(f"NPY header of {len(header)} bytes exceeds the reserved {size} bytes.")
+
+        position = self._f_obj.tell()
+        self._f_obj.seek(0)
+        self._f_obj.write(self._MAGIC + struct.pack('<H', size) + header)
+
+        if position > self._HEADER_SIZE:
+            self._f_obj.seek(position)
+
+    def _finalize(self) -> None:
+        """ Patches the number of samples into the header and writes the sidecar.
+        """
+        if self._dtype is None:
+            # no samples, store an empty array
+            self._allocate(self._EMPTY_DTYPE, len(self.column_names or []))
+
+        if self.layout == "samples_major" and self._offset != self.length:
+            self._write_header(self._offset)
+
+        if self.layout == "channels_major":
+            if self._datablock is not None:
+                self._datablock.flush()
+            if self._offset < self.length:
+                warn(f"Only {self._offset} of {self.length} preallocated samples written to {self.f_path}.")
+
+        content = {
+            "file": os.path.basename(os.fsdecode(self.f_path)),
+            "dtype": self._dtype.str,
+            "shape": list(self._shape(self._offset if self.layout == "samples_major" else self.length)),
+            "layout": self.layout,
+            "column_names": list(self.column_names),
+            "sampling_freq": self.sampling_freq,
+            "resolution": self.resolution,
+            "factor": self.factor,
+            "units": self.units,
+            **self.metadata,
+            "entries": self._marks,
+        }
+
+        with open(self.sidecar_path, "w") as f_obj:
+            f_obj.write(pretty_json(content))
+
+
+class ArrowPlanter(DatalogPlanter):
+    """ Writes samples as record batches into an Arrow IPC (.arrow) or Parquet (.parquet) file.
+
+    Each chunk becomes a record batch with one column per channel, optionally preceded by an int64 sample
+    index or a timestamp column. Arrow IPC batches are written as they come, Parquet batches are collected
+    into row groups of `row_group_size` rows. Sampling frequency and scale are stored in the schema metadata.
+    """
+
+    # default number of rows of Parquet row groups
+    _ROW_GROUP_SIZE = 2**20
+    # data type of channels of empty files, same as samples scaled by the parser and as NPYPlanter
+    _EMPTY_DTYPE = '<i4'
+
+    def __init__(
+        self,
+        f_path: Union[str, bytes, os.PathLike],
+        column_names: Union[List, Tuple, None] = None,
+        **kwargs,
+    ):
+
+        super().__init__(f_path, column_names)
+
+        if pa is None:
+            raise ImportError(f"Output into {self._extension} requires the optional `pyarrow` package.")
+
+        self.sampling_freq = kwargs.pop("sampling_freq", 1)
+        self.units = kwargs.pop("units", "uV")
+        self.factor = kwargs.pop("factor", 1000)
+        self.resolution = kwargs.pop("resolution", 1)
+
+        # leading index column
+        self.index = _validate_str("index column", kwargs.pop("index", "none"), valid_set={"none", "sample", "timestamp"})
+        # unix timestamp of the datalog in seconds and position of the first written sample
+        self.timestamp = kwargs.pop("timestamp", None)
+        self.offset = _validate_int("sample offset", kwargs.pop("offset", 0), min_value=0)
+        if self.index == "timestamp" and self.timestamp is None:
+            raise ValueError("Timestamp index column requires the timestamp of the datalog.")
+
+        row_group_size = kwargs.pop("row_group_size", None)
+        self.row_group_size = _validate_int("row group size", row_group_size, min_value=1) if row_group_size is not None else self._ROW_GROUP_SIZE
+
+        # codec of the file, Parquet default (snappy) or uncompressed Arrow IPC if not provided
+        if self._extension == ".parquet":
+            valid_set = {"none", "snappy", "gzip", "brotli", "lz4", "zstd"}
+        else:
+            valid_set = {"lz4", "zstd"}
+        compression = kwargs.pop("compression", None)
+        self.compression = _validate_str("compression", compression, valid_set=valid_set) if compression is not None else None
+        self.compression_level = _validate_int("compression level", kwargs.pop("compression_level", None), min_value=-7, mxn_value=22)
+
+        self._writer = None
+        self._schema = None
+        self._pending = list()
+        self._pending_size = 0
+
+    def __enter__(self):
+        try:
+            self._f_obj = open(self.f_path, "wb")
+        except IOError as e:
+            raise IOError(e)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            if self._f_obj and exc_type is None:
+                if self._writer is None:
+                    # no samples, store the schema only
+                    self._open(np.dtype(self._EMPTY_DTYPE), len(self.column_names or []))
+
+                # write the last incomplete row group and the footer
+                self._flush(final=True)
+                self._writer.close()
+        finally:
+            self._writer = None
+            self._pending, self._pending_size = list(), 0
+            super().__exit__(exc_type, exc_value, exc_traceback)
+
+    def write(
+        self,
+        darray: NumpyArray,
+        **kwargs,
+        ) -> None:
+        """ Appends samples as a record batch, the schema is given by the first chunk.
+
+        Args:
+            darray (NumpyArray): samples of shape (samples, channels)
+        """
+        if self._writer is None:
+            self._open(darray.dtype, darray.shape[1])
+
+        # single copy into contiguous channels; arrays wrap them without copying and outlive reused chunk buffers
+        columns = [pa.array(column) for column in darray.T.copy()]
 
-        # write data
-        self._f_obj.write(('\n'.join([self._fmt]*darray.shape[0]) + '\n') % tuple(darray.ravel()))
+        if self.index != "none":
+            columns.insert(0, self._indexcolumn(darray.shape[0]))
 
+        batch = pa.RecordBatch.from_arrays(columns, schema=self._schema)
+        self.offset += darray.shape[0]
+
+        if self._extension == ".arrow":
+            self._writer.write_batch(batch)
+            return
+
+        self._pending.append(batch)
+        self._pending_size += batch.num_rows
+
+        if self._pending_size >= self.row_group_size:
+            self._flush()
+
+    def _indexcolumn(self, n_samples: int) -> Any:
+        """ Returns the sample index or timestamps of the next `n_samples` samples.
+        """
+        index = np.arange(self.offset, self.offset + n_samples, dtype=np.int64)
+
+        if self.index == "sample":
+            return pa.array(index)
+
+        # microseconds since the epoch
+        index = self.timestamp * 1_000_000 + index * 1_000_000 // self.sampling_freq
+        return pa.array(index, type=pa.timestamp("us"))
+
+    def _open(
+        self,
+        dtype: np.dtype,
+        n_columns: int,
+        ) -> None:
+        """ Creates the schema and the writer of the file.
+        """
+        if self.column_names is None:
+            # create arbitrary column names if not provided
+            self.column_names = [str(i) for i in range(n_columns)]
+        else:
+            assert len(self.column_names) == n_columns
+
+        fields = [pa.field(name, pa.from_numpy_dtype(dtype), nullable=False) for name in self.column_names]
+        if self.index == "sample":
+            fields.insert(0, pa.field("sample", pa.int64(), nullable=False))
+        elif self.index == "timestamp":
+            fields.insert(0, pa.field("timestamp", pa.timestamp("us"), nullable=False))
+
+        metadata = {
+            "sampling_freq": str(self.sampling_freq),
+            "resolution": str(self.resolution),
+            "factor": str(self.factor),
+            "units": str(self.units),
+        }
+        self._schema = pa.schema(fields, metadata=metadata)
+
+        if self._extension == ".parquet":
+            self._writer = pq.ParquetWriter(
+                self._f_obj,
+                self._schema,
+                compression=self.compression or "snappy",
+                compression_level=self.compression_level,
+                )
+        else:
+            codec = pa.Codec(self.compression, self.compression_level) if self.compression is not None else None
+            self._writer = pa.ipc.new_file(
+                self._f_obj,
+                self._schema,
+                options=pa.ipc.IpcWriteOptions(compression=codec),
+                )
+
+    def _flush(self, final: bool = False) -> None:
+        """ Writes collected Parquet batches as complete row groups, the remainder is kept unless final.
+        """
+        if not self._pending:
+            return
+
+        table = pa.Table.from_batches(self._pending, schema=self._schema)
+        n_rows = table.num_rows if final else table.num_rows - table.num_rows % self.row_group_size
+
+        if n_rows:
+            self._writer.write_table(table.slice(0, n_rows), row_group_size=self.row_group_size)
+
+        remainder = table.slice(n_rows)
+        self._pending = remainder.to_batches() if remainder.num_rows else list()
+        self._pending_size = remainder.num_rows
+
+
+class EDFPlanter(DatalogPlanter):
+    """ Writes samples into a continuous EDF+ (EDF+C) file of fixed duration data records.
+
+    Samples are stored as 16-bit digital values of `step` raw counts each, the physical range in uV follows
+    from the amplifier resolution. Chunks are packed into data records as they come, only an incomplete
+    record is kept in memory. Every record holds an EDF Annotations signal with its time-keeping annotation
+    and a reserved space, entries are written into the reserved space of their records on close together
+    with the number of records.
+    """
+
+    # digital range of EDF samples
+    _DIGITAL_MIN = -32768
+    _DIGITAL_MAX = 32767
+    # default size of the annotation signal per record in bytes
+    _ANNOTATION_SIZE = 256
+    # header byte offset and width of the number of data records
+    _NRECORDS_FIELD = 236, 8
+
+    def __init__(
+        self,
+        f_path: Union[str, bytes, os.PathLike],
+        column_names: Union[List, Tuple, None] = None,
+        **kwargs,
+    ):
+
+        super().__init__(f_path, column_names)
+
+        self.sampling_freq = kwargs.pop("sampling_freq", 1)
+        self.resolution = kwargs.pop("resolution", 1)
+        # unix timestamp of the first sample in seconds
+        self.timestamp = kwargs.pop("timestamp", 0)
+        # description of amplifier filters stored per signal
+        self.prefiltering = kwargs.pop("prefiltering", "")
+
+        # duration of a data record in seconds, must hold a whole number of samples
+        self.record_duration = kwargs.pop("record_duration", 1)
+        self.record_length = int(round(self.sampling_freq * self.record_duration))
+        if self.record_length < 1 or not np.isclose(self.record_length, self.sampling_freq * self.record_duration):
+            raise ValueError(f"Record duration of {self.record_duration} s does not hold a whole number of samples at {self.sampling_freq} Hz.")
+
+        # raw counts per digital value, the smallest step covering the physical maximum in uV if provided
+        physical_max = kwargs.pop("physical_max", None)
+        if physical_max is not None:
+            self.step = max(1, int(np.ceil(physical_max * 1000 / self.resolution / self._DIGITAL_MAX)))
+        else:
+            self.step = 1
+
+        annotation_size = _validate_int("annotation size", kwargs.pop("annotation_size", None), min_value=32)
+        annotation_size = annotation_size or self._ANNOTATION_SIZE
+        # annotation signal consists of 2-byte samples
+        self.annotation_size = annotation_size + annotation_size % 2
+
+        self._n_columns = None
+        self._record_size = None
+        self._remainder = None
+        self._n_records = 0
+        self._n_clipped = 0
+        self._marks = list()
+
+    def __enter__(self):
+        try:
+            self._f_obj = open(self.f_path, "wb+")
+        except IOError as e:
+            raise IOError(e)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            if self._f_obj and exc_type is None:
+                self._finalize()
+        finally:
+            self._remainder = None
+            super().__exit__(exc_type, exc_value, exc_traceback)
+
+    def write(
+        self,
+        darray: NumpyArray,
+        **kwargs,
+        ) -> None:
+        """ Appends samples of shape (samples, channels) in raw counts, complete data records are written.
+
+        Args:
+            darray (NumpyArray): samples of shape (samples, channels)
+
+        Raises:
+            ValueError: inconsistent number of channels
+        """
+        if self._n_columns is None:
+            self._store_header(darray.shape[1])
+
+        if darray.shape[1] != self._n_columns:
+            raise ValueError(f"Inconsistent shape of the input data. Expected {self._n_columns} channels, got {darray.shape[1]} instead.")
+
+        digital = self._digitize(darray)
+
+        # complete the pending record first
+        if len(self._remainder):
+            missing = self.record_length - len(self._remainder)
+            self._remainder = np.concatenate((self._remainder, digital[:missing]))
+            digital = digital[missing:]
+
+            if len(self._remainder) < self.record_length:
+                return
+
+            self._write_records(self._remainder)
+            self._remainder = self._remainder[:0]
+
+        n_samples = len(digital) - len(digital) % self.record_length
+        self._write_records(digital[:n_samples])
+        self._remainder = digital[n_samples:].copy()
+
+    def add_marks(
+        self,
+        positions: Union[List, Tuple],
+        groups: Union[List, Tuple],
+        messages: Union[List, Tuple],
+        ) -> None:
+        """ Stores entries written into the annotation signal on close.
+
+        Args:
+            positions (Union[List, Tuple]): sample positions of entries
+            groups (Union[List, Tuple]): groups of entries
+            messages (Union[List, Tuple]): text of entries
+        """
+        self._marks = sorted(
+            (position / self.sampling_freq, str(message)) for position, message in zip(positions, messages)
+            )
+
+    def _digitize(self, darray: NumpyArray) -> NumpyArray:
+        """ Converts raw counts into 16-bit digital values, out of range values are clipped.
+        """
+        if self.step != 1 or darray.dtype.kind == "f":
+            darray = np.rint(darray / self.step)
+
+        clipped = (darray < self._DIGITAL_MIN) | (darray > self._DIGITAL_MAX)
+        self._n_clipped += int(np.count_nonzero(clipped))
+
+        return np.clip(darray, self._DIGITAL_MIN, self._DIGITAL_MAX).astype('<i2')
+
+    def _write_records(self, digital: NumpyArray) -> None:
+        """ Writes samples of complete records followed by their time-keeping annotations.
+        """
+        n_records = len(digital) // self.record_length
+        if not n_records:
+            return
+
+        records = np.zeros((n_records, self._record_size // 2), dtype='<i2')
+        # each record stores signals one after another
+        records[:, :-self.annotation_size // 2].reshape(n_records, self._n_columns, self.record_length)[:] = (
+            digital.reshape(n_records, self.record_length, self._n_columns).transpose(0, 2, 1)
+            )
+
+        annotations = records.view(np.uint8)[:, -self.annotation_size:]
+        for idx in range(n_records):
+            tal = self._timekeeping(self._n_records + idx)
+            annotations[idx, :len(tal)] = np.frombuffer(tal, dtype=np.uint8)
+
+        self._f_obj.write(records.tobytes())
+        self._n_records += n_records
+
+    def _timekeeping(self, record: int) -> bytes:
+        """ Returns the time-keeping annotation starting the annotation signal of the record.
+        """
+        return b"+" + _edfonset(record * self.record_duration) + b"\x14\x14\x00"
+
+    def _store_header(self, n_columns: int) -> None:
+        """ Writes the EDF+ header with unknown number of data records.
+        """
+        if self.column_names is None:
+            # create arbitrary column names if not provided
+            self.column_names = [str(i) for i in range(n_columns)]
+        else:
+            assert len(self.column_names) == n_columns
+
+        self._n_columns = n_columns
+        self._record_size = 2 * n_columns * self.record_length + self.annotation_size
+        self._remainder = np.empty((0, n_columns), dtype='<i2')
+
+        # physical range in uV
+        gain = self.step * self.resolution / 1000
+        physical = (_edfnumber(self._DIGITAL_MIN * gain), _edfnumber(self._DIGITAL_MAX * gain))
+
+        start = datetime.fromtimestamp(self.timestamp)
+        n_signals = n_columns + 1
+
+        header = [
+            ("0", 8),
+            # anonymous patient and recording identification
+            ("X X X X", 80),
+            ("Startdate " + start.strftime("%d-%b-%Y").upper() + " X X X", 80),
+            (start.strftime("%d.%m.%y"), 8),
+            (start.strftime("%H.%M.%S"), 8),
+            (str(256 * (n_signals + 1)), 8),
+            ("EDF+C", 44),
+            ("-1", 8),
+            (_edfnumber(self.record_duration), 8),
+            (str(n_signals), 4),
+        ]
+
+        signals = [
+            (list(self.column_names) + ["EDF Annotations"], 16),
+            (["" for _ in range(n_signals)], 80),
+            (["uV"] * n_columns + [""], 8),
+            ([physical[0]] * n_columns + ["-1"], 8),
+            ([physical[1]] * n_columns + ["1"], 8),
+            ([str(self._DIGITAL_MIN)] * n_signals, 8),
+            ([str(self._DIGITAL_MAX)] * n_signals, 8),
+            ([self.prefiltering] * n_columns + [""], 80),
+            ([str(self.record_length)] * n_columns + [str(self.annotation_size // 2)], 8),
+            (["" for _ in range(n_signals)], 32),
+        ]
+        for values, width in signals:
+            header.extend((value, width) for value in values)
+
+        self._f_obj.write(b"".join(_edffield(value, width) for value, width in header))
+
+    def _finalize(self) -> None:
+        """ Writes the incomplete record, entries and the number of records.
+        """
+        if self._n_columns is None:
+            # no samples, store the header only
+            self._store_header(len(self.column_names or []))
+
+        if len(self._remainder):
+            # pad the last record with zeros to the record duration
+            padding = np.zeros((self.record_length - len(self._remainder), self._n_columns), dtype='<i2')
+            self._write_records(np.concatenate((self._remainder, padding)))
+
+        if self._n_clipped:
+            warn(f"{self._n_clipped} samples out of the EDF physical range clipped in {self.f_path}.")
+
+        self._store_marks()
+
+        offset, width = self._NRECORDS_FIELD
+        self._f_obj.seek(offset)
+        self._f_obj.write(_edffield(str(self._n_records), width))
+
+    def _store_marks(self) -> None:
+        """ Writes entries into the annotation signal of their records, or of the next records with free space.
+        """
+        header_size = 256 * (self._n_columns + 2)
+        contents = dict()
+        n_dropped = 0
+
+        record = 0
+        for onset, message in self._marks:
+            # control characters delimit annotations
+            message = message.replace("\x14", " ").replace("\x00", " ")
+            tal = b"+" + _edfonset(onset) + b"\x14" + message.encode("utf-8") + b"\x14\x00"
+
+            record = max(record, int(onset // self.record_duration))
+            while record < self._n_records:
+                content = contents.setdefault(record, self._timekeeping(record))
+                if len(content) + len(tal) <= self.annotation_size:
+                    contents[record] = content + tal
+                    break
+                record += 1
+            else:
+                n_dropped += 1
+
+        for record, content in contents.items():
+            self._f_obj.seek(header_size + (record + 1) * self._record_size - self.annotation_size)
+            self._f_obj.write(content)
+
+        if n_dropped:
+            warn(f"{n_dropped} entries do not fit into EDF annotations of {self.f_path}, consider larger annotation size.")
 
 
 class HDFPlanter(DatalogPlanter):
@@ -214,11 +1035,15 @@ class HDFPlanter(DatalogPlanter):
     _INFO_DNAME = 'Info'
     _CHANNEL_DNAME = 'ChannelSettings'
     _MARKS_DNAME = 'Marks'
+    _ENVELOPE_DNAME = 'Envelope_{}'
     _DATACACHE_NAME = 'RAW'
     _LEFT_INDEX = 0
     _RIGHT_INDEX = 100
     _UNITS = 'mV'
     _PARSER = 'Epycon'
+    _BLOCK_SIZE = 1024
+    _CHUNK_SAMPLES = 65536
+    _EXTERNAL_DTYPE = '<i4'
     
     def __init__(
         self,
@@ -235,42 +1060,178 @@ class HDFPlanter(DatalogPlanter):
         self.units = kwargs.pop("units", "uV")
         self.entries = kwargs.pop("entries", None)
         self.factor = kwargs.pop("factor", 1000)
+        self.resolution = kwargs.pop("resolution", 1)
+
+        # expected number of samples, Data dataset is allocated at once and written by offset if provided
+        length = kwargs.pop("length", None)
+        self.length = _validate_int("expected length", length, min_value=0) if length is not None else None
+        # chunk shape (samples, channels) of Data dataset, contiguous if preallocated and not provided
+        chunks = kwargs.pop("chunks", None)
+        self.chunks = _validate_tuple("chunk shape", tuple(chunks), size=2, dtype=int) if chunks is not None else None
+
+        # filters applied to chunks of Data dataset
+        compression = kwargs.pop("compression", None)
+        compression_level = kwargs.pop("compression_level", None)
+        if compression is not None:
+            compression = _validate_str("compression", compression, valid_set={"gzip", "lzf"})
+        if compression == "gzip" and compression_level is not None:
+            compression_level = _validate_int("compression level", compression_level, min_value=0, mxn_value=9)
+        else:
+            compression_level = None
+
+        self.filters = dict(
+            compression=compression,
+            compression_opts=compression_level,
+            shuffle=bool(kwargs.pop("shuffle", False)),
+            fletcher32=bool(kwargs.pop("fletcher32", False)),
+            )
+
+        # storage of samples; float32 in physical units readable by SignalPlant, raw counts, or counts referenced in the datalog
+        self.mode = _validate_str("HDF mode", kwargs.pop("mode", "float32"), valid_set={"float32", "raw", "external"})
+
+        # lossless scale-offset filter of integer counts
+        self.scaleoffset = bool(kwargs.pop("scaleoffset", False))
+        if self.scaleoffset and self.mode != "raw":
+            raise ValueError("Scale-offset filter is supported for raw HDF mode only.")
+        if self.scaleoffset and self.filters["fletcher32"]:
+            raise ValueError("Scale-offset filter can not be combined with fletcher32 checksums.")
+
+        # order of Data dataset axes; channels x samples read by SignalPlant, or samples x channels written without transposing
+        self.layout = _validate_str("HDF layout", kwargs.pop("layout", "channels_major"), valid_set={"channels_major", "samples_major"})
+        if self.mode == "external":
+            # external samples are referenced in the order of the datablock
+            self.layout = "samples_major"
+
+        # decimation factors of min/max envelopes, each a multiple of the previous one; nothing is streamed in external mode
+        envelope = kwargs.pop("envelope", None)
+        self.envelope = sorted(envelope) if envelope and self.mode != "external" else list()
+        for previous, factor in zip([1] + self.envelope, self.envelope):
+            if factor <= previous or factor % previous:
+                raise ValueError(f"Envelope decimation factors expected to be increasing multiples, got {self.envelope} instead.")
+
+        # size of the raw data chunk cache in bytes, HDF5 default if not provided
+        cache_size = kwargs.pop("cache_size", None)
+        self.cache_size = _validate_int("chunk cache size", cache_size, min_value=0) if cache_size is not None else None
 
         self._header_isstored = False
+        self._offset = 0
+        self._dtype = None
+        # axis of samples in Data dataset
+        self._axis = 0 if self.layout == "samples_major" else 1
+        # minima and maxima of incomplete envelope bins per level
+        self._pending = [None] * len(self.envelope)
 
     def __enter__(self):
         try:            
-            self._f_obj = h.File(self.f_path, "w")
+            self._f_obj = h.File(self.f_path, "w", rdcc_nbytes=self.cache_size)
         except IOError as e:
             raise IOError(e)
         return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        # store incomplete bins at the end of envelopes
+        if self._f_obj and exc_type is None and self.envelope and self._dtype is not None:
+            self._add_envelope(None, None, final=True)
+
+        # shrink preallocated dataset if fewer samples than expected were written
+        if (
+            self._f_obj
+            and exc_type is None
+            and self.length is not None
+            and self._DATASET_DNAME in self._f_obj
+            and self._offset < self._f_obj[self._DATASET_DNAME].shape[self._axis]
+            ):
+            dataset = self._f_obj[self._DATASET_DNAME]
+            if dataset.chunks is not None:
+                dataset.resize(self._offset, axis=self._axis)
+            else:
+                warn(f"Only {self._offset} of {dataset.shape[self._axis]} preallocated samples written to {self.f_path}.")
+
+        super().__exit__(exc_type, exc_value, exc_traceback)
     
     def write(
             self,
             darray: NumpyArray,            
         ) -> None:
                 
+        if self.mode == "external":
+            raise ValueError("Samples of external HDF mode are referenced by `add_external`, not written.")
+
         # write header
-        if not self._header_isstored:
-            if self.column_names is None:
-                # create arbitrary column names if not provided
-                self.column_names = [str(i) for i in range(darray.shape[1])]
-            else:
-                assert len(self.column_names) == darray.shape[1]
-            
-            # make a list of encoded channel names with removed white spaces
-            self.column_names = [''.join(item.split()).encode('UTF-8') for item in self.column_names]
+        self._store_header(darray.shape[1])
+        
+        self.add_samples(darray)
 
-            # write attributes
-            self._generate_attributes()
-            # write channel info
-            self._generate_channel_info()
-            # write channel settings
-            self._generate_channel_settings()
+    def _store_header(
+            self,
+            n_columns: int,
+            ) -> None:
+        """ Writes file attributes, channel info and channel settings once.
 
-            self._header_isstored = True
+        Args:
+            n_columns (int): number of channels
+        """
+        if self._header_isstored:
+            return
+
+        if self.column_names is None:
+            # create arbitrary column names if not provided
+            self.column_names = [str(i) for i in range(n_columns)]
+        else:
+            assert len(self.column_names) == n_columns
         
-        self.add_samples(darray)
+        # make a list of encoded channel names with removed white spaces
+        self.column_names = [''.join(item.split()).encode('UTF-8') for item in self.column_names]
+
+        # write attributes
+        self._generate_attributes()
+        # write channel info
+        self._generate_channel_info()
+        # write channel settings
+        self._generate_channel_settings()
+
+        self._header_isstored = True
+
+    def add_external(
+            self,
+            f_path: Union[str, bytes, os.PathLike],
+            offset: int,
+            n_samples: int,
+            n_columns: int,
+            ) -> None:
+        """ Creates int32 Data dataset of shape (samples, columns) backed by samples stored in an external raw file.
+
+        No samples are copied, the dataset points to the datablock of the datalog and is readable only as long as
+        the datalog stays at its absolute path. Samples are raw counts in the order of the datablock columns.
+
+        Args:
+            f_path (Union[str, bytes, os.PathLike]): path to the file storing samples, e.g. WorkMate datalog
+            offset (int): byte address of the first sample, e.g. `Header.datablock_address`
+            n_samples (int): number of samples
+            n_columns (int): number of columns, e.g. `Header.num_channels`
+
+        Raises:
+            ValueError: planter not in external mode or Data dataset exists
+        """
+        if self.mode != "external":
+            raise ValueError(f"External samples require external HDF mode, got {self.mode} instead.")
+        if self._DATASET_DNAME in self._f_obj:
+            raise ValueError(f"Dataset {self._DATASET_DNAME} already exists in {self.f_path}.")
+
+        self._store_header(n_columns)
+
+        self._dtype = np.dtype(self._EXTERNAL_DTYPE)
+        nbytes = n_samples * n_columns * self._dtype.itemsize
+
+        self._f_obj.create_dataset(
+            self._DATASET_DNAME,
+            shape=(n_samples, n_columns),
+            dtype=self._dtype,
+            external=[(os.path.abspath(f_path), offset, nbytes)],
+            )
+
+        self._generate_scale_attributes()
+        self._offset = n_samples
 
     
     def _generate_attributes(self) -> None:
@@ -368,6 +1329,8 @@ class HDFPlanter(DatalogPlanter):
                 del self._f_obj[self._INFO_DNAME]
             
             self._f_obj.create_dataset(self._INFO_DNAME, data=content)
+            # order of Data dataset axes
+            self._f_obj[self._INFO_DNAME].attrs['Layout'] = self.layout
 
     def add_samples(
             self,
@@ -382,35 +1345,312 @@ class HDFPlanter(DatalogPlanter):
             ValueError: Incosistent shape of the input data.
         """
         # TODO: export json with fs, resolution and units
-        # columns -> samples, rows -> channels
-        darray = darray.transpose()
+        # samples as they come (samples, channels), envelopes are reduced along samples before the transposition
+        samples = darray
+
+        if self.layout == "channels_major":
+            # columns -> samples, rows -> channels
+            darray = darray.transpose()
+
+        n_samples, n_channels = darray.shape[self._axis], darray.shape[1 - self._axis]
+
+        if self.mode == "raw":
+            # counts are stored as they are, integer leads as int32 and weighted leads as float32
+            if self._dtype is None:
+                self._dtype = np.dtype(np.int32) if np.issubdtype(darray.dtype, np.integer) else np.dtype(np.float32)
+            darray = self._copy(darray, self._dtype)
 
         # Only float32 supported by SignalPlant
-        if not np.issubdtype(darray.dtype, np.float32):
-            darray = darray.astype(np.float32) / self.factor
+        elif not np.issubdtype(darray.dtype, np.float32):
+            darray = self._scale(darray)
+
+        if self._dtype is None:
+            self._dtype = np.dtype(self.cfg.DATASET_DTYPE)
+
+        if self.envelope:
+            # envelopes are built while samples stream through
+            self._add_envelope(samples, samples)
 
         # Create new dataset if not exists
         if not self._DATASET_DNAME in self._f_obj:
-            self._f_obj.create_dataset(self._DATASET_DNAME, data=darray, shape=darray.shape, dtype=self.cfg.DATASET_DTYPE, chunks=True, maxshape=(darray.shape[0], None))            
-            return
+            if self.length is not None:
+                self._allocate(n_channels)
+            else:
+                chunks = self._chunkshape(n_channels, n_samples) if self.chunks is not None or self.scaleoffset else True
+                self._f_obj.create_dataset(self._DATASET_DNAME, data=darray, shape=darray.shape, dtype=self._dtype, chunks=chunks, maxshape=self._shape(n_channels, None), **self._filters())
+                self._generate_scale_attributes()
+                self._offset = n_samples
+                return
+
+        dataset = self._f_obj[self._DATASET_DNAME]
     
         # Check for data shape consistency, raise error if does not match
-        if self._f_obj[self._DATASET_DNAME].shape[0] != darray.shape[0]:
+        if dataset.shape[1 - self._axis] != n_channels:
             raise ValueError(
                 f"""Inconsistent shape of the input data.
-                Expected to be {self.f_obj[self._DATASET_DNAME].shape[0]}, 
-                got {darray.shape[0]} instead."""
+                Expected to be {dataset.shape[1 - self._axis]}, 
+                got {n_channels} instead."""
                 )            
 
-        # reshape hdf dataset
-        self._f_obj[self._DATASET_DNAME].resize(
-            self._f_obj[self._DATASET_DNAME].shape[1] + darray.shape[1],
-            axis=1,
-            )
-                
-        # append samples
-        self._f_obj[self._DATASET_DNAME][:, -darray.shape[1]:] = darray 
-        
+        stop = self._offset + n_samples
+        if stop > dataset.shape[self._axis]:
+            if dataset.maxshape[self._axis] is not None:
+                raise ValueError(
+                    f"Expected {dataset.shape[self._axis]} samples, got at least {stop} instead."
+                    )
+
+            # reshape hdf dataset
+            dataset.resize(stop, axis=self._axis)
+
+        # write samples by offset
+        dataset[self._shape(slice(None), slice(self._offset, stop))] = darray
+        self._offset = stop
+
+    def _allocate(
+            self,
+            n_channels: int,
+            ) -> None:
+        """ Creates Data dataset of the expected length at once, contiguous or with the given chunk shape.
+
+        Args:
+            n_channels (int): number of channels
+        """
+        shape = self._shape(n_channels, self.length)
+
+        filters = self._filters()
+        # filters require chunked storage
+        isfiltered = any((filters["compression"], filters["shuffle"], filters["fletcher32"], "scaleoffset" in filters))
+
+        if self.chunks is None and not isfiltered:
+            # contiguous dataset, samples are written straight to the file without fill values
+            self._f_obj.create_dataset(self._DATASET_DNAME, shape=shape, dtype=self._dtype, fill_time="never")
+        else:
+            self._f_obj.create_dataset(
+                self._DATASET_DNAME,
+                shape=shape,
+                dtype=self._dtype,
+                chunks=self._chunkshape(n_channels, self.length),
+                maxshape=self._shape(n_channels, None),
+                **filters,
+                )
+
+        self._generate_scale_attributes()
+
+    def _filters(self) -> Dict[str, Any]:
+        """ Returns filters of Data dataset, scale-offset is applied to integer counts only as it is lossy otherwise.
+        """
+        filters = dict(self.filters)
+
+        if self.scaleoffset:
+            if np.issubdtype(self._dtype, np.integer):
+                # minimum number of bits computed per chunk
+                filters["scaleoffset"] = 0
+            else:
+                warn(f"Scale-offset filter skipped for {self._dtype} samples of {self.f_path}.")
+
+        return filters
+
+    def _generate_scale_attributes(self, name: str = _DATASET_DNAME) -> None:
+        """ Stores attributes to convert raw counts into physical units as `Data * resolution / factor`.
+        """
+        if self.mode == "float32":
+            return
+
+        dataset = self._f_obj[name]
+        dataset.attrs["resolution"] = self.resolution
+        dataset.attrs["factor"] = self.factor
+
+        # units are encoded per channel once the header is stored
+        units = self.units if self.units is not None else self._UNITS
+        if isinstance(units, (list, tuple)):
+            units = [item.decode('UTF-8') if isinstance(item, bytes) else item for item in units]
+            units = units[0] if len(set(units)) == 1 else units
+
+        dataset.attrs["units"] = units
+
+    def _add_envelope(
+            self,
+            minima: Optional[NumpyArray],
+            maxima: Optional[NumpyArray],
+            final: bool = False,
+            ) -> None:
+        """ Appends minima and maxima of complete bins of each envelope level, cascaded from the previous level.
+
+        Envelope datasets are named by their decimation factor and ordered by the layout of Data dataset with
+        minima and maxima along the last axis. Bins are reduced from samples of shape (samples, channels) and
+        converted into the data type of Data dataset afterwards, which gives the same values as minima and
+        maxima of stored samples. Incomplete bins are kept until the next samples or stored as they are if final.
+
+        Args:
+            minima (Optional[NumpyArray]): minima of the previous level of shape (bins, channels), samples at level 0
+            maxima (Optional[NumpyArray]): maxima of the previous level of shape (bins, channels), samples at level 0
+            final (bool, optional): whether to store incomplete bins. Defaults to False.
+        """
+        previous = 1
+        for level, factor in enumerate(self.envelope):
+            ratio, previous = factor // previous, factor
+
+            # prepend incomplete bin of the level
+            if self._pending[level] is not None:
+                if minima is None:
+                    minima, maxima = self._pending[level]
+                else:
+                    minima = np.concatenate((self._pending[level][0], minima))
+                    maxima = np.concatenate((self._pending[level][1], maxima))
+                self._pending[level] = None
+
+            if minima is None:
+                # nothing to pass to the next levels
+                continue
+
+            n_bins, n_rest = divmod(len(minima), ratio)
+            if n_rest and not final:
+                # keep the incomplete bin, chunk buffers may be reused by the caller
+                self._pending[level] = (minima[n_bins * ratio:].copy(), maxima[n_bins * ratio:].copy())
+                minima, maxima = minima[:n_bins * ratio], maxima[:n_bins * ratio]
+
+            if not len(minima):
+                minima = maxima = None
+                continue
+
+            minima = np.min(self._bins(minima, ratio), axis=1)
+            maxima = np.max(self._bins(maxima, ratio), axis=1)
+
+            self._store_envelope(factor, minima, maxima)
+
+    def _bins(
+            self,
+            darray: NumpyArray,
+            ratio: int,
+            ) -> NumpyArray:
+        """ Reshapes samples (samples, channels) into bins (bins, ratio, channels), the last bin is padded by its edge values.
+        """
+        n_rest = len(darray) % ratio
+        if n_rest:
+            darray = np.pad(darray, ((0, ratio - n_rest), (0, 0)), mode="edge")
+
+        return darray.reshape(-1, ratio, darray.shape[1])
+
+    def _store_envelope(
+            self,
+            factor: int,
+            minima: NumpyArray,
+            maxima: NumpyArray,
+            ) -> None:
+        """ Appends bins (bins, channels) to the envelope dataset of the decimation factor, the dataset is created at first.
+        """
+        name = self._ENVELOPE_DNAME.format(factor)
+        n_bins, n_channels = minima.shape
+
+        # same conversion as of Data dataset, monotonic so that minima and maxima are preserved
+        content = np.stack((minima, maxima), axis=-1)
+        if self.mode == "raw":
+            content = content.astype(self._dtype, copy=False)
+        elif content.dtype != np.float32:
+            content = self._scale(content)
+
+        if self.layout == "channels_major":
+            content = content.transpose(1, 0, 2)
+
+        if name not in self._f_obj:
+            self._f_obj.create_dataset(
+                name,
+                data=content,
+                chunks=True,
+                maxshape=self._shape(n_channels, None) + (2,),
+                )
+            self._f_obj[name].attrs["Decimation"] = factor
+            self._generate_scale_attributes(name)
+            return
+
+        dataset = self._f_obj[name]
+        start = dataset.shape[self._axis]
+        dataset.resize(start + n_bins, axis=self._axis)
+        dataset[self._shape(slice(None), slice(start, start + n_bins))] = content
+
+    def _shape(
+            self,
+            channels: Any,
+            samples: Any,
+            ) -> Tuple[Any, Any]:
+        """ Orders shape, index or other pair of channel and sample items by the layout of Data dataset.
+        """
+        return (samples, channels) if self.layout == "samples_major" else (channels, samples)
+
+    def _chunkshape(
+            self,
+            n_channels: int,
+            n_samples: int,
+            ) -> Tuple[int, int]:
+        """ Converts the chunk shape (samples, channels) into the dataset layout, bounded by the dataset shape.
+
+        If chunk shape is not provided, chunks of `_CHUNK_SAMPLES` values hold a single channel in channels major
+        layout and all channels in samples major layout.
+        """
+        if self.chunks is not None:
+            samples, channels = self.chunks
+        elif self.layout == "samples_major":
+            samples, channels = max(1, self._CHUNK_SAMPLES // n_channels), n_channels
+        else:
+            samples, channels = self._CHUNK_SAMPLES, 1
+
+        return self._shape(max(1, min(channels, n_channels)), max(1, min(samples, n_samples)))
+
+    def _scale(
+            self,
+            darray: NumpyArray,
+            ) -> NumpyArray:
+        """ Converts samples into float32 physical units as `darray * resolution / factor`.
+
+        Raw counts are cast and scaled into a single C-contiguous float32 buffer. Transposed input is converted
+        in blocks of samples, which is considerably faster than a plain transposed copy.
+
+        Args:
+            darray (NumpyArray): raw counts or samples already multiplied by resolution
+
+        Returns:
+            NumpyArray: float32 samples
+        """
+        out = np.empty(darray.shape, dtype=np.float32)
+
+        for idx in range(0, darray.shape[-1], self._BLOCK_SIZE):
+            block = np.s_[..., idx:idx + self._BLOCK_SIZE]
+
+            if self.resolution != 1:
+                np.multiply(darray[block], self.resolution, out=out[block], dtype=np.float32, casting="unsafe")
+            else:
+                np.divide(darray[block], self.factor, out=out[block], dtype=np.float32, casting="unsafe")
+
+        if self.resolution != 1:
+            np.divide(out, self.factor, out=out)
+
+        return out
+
+    def _copy(
+            self,
+            darray: NumpyArray,
+            dtype: np.dtype,
+            ) -> NumpyArray:
+        """ Copies samples into a C-contiguous buffer of the given data type in blocks of samples.
+
+        Args:
+            darray (NumpyArray): raw counts, usually transposed
+            dtype (np.dtype): data type of the output
+
+        Returns:
+            NumpyArray: C-contiguous samples
+        """
+        if darray.flags.c_contiguous and darray.dtype == dtype:
+            return darray
+
+        out = np.empty(darray.shape, dtype=dtype)
+
+        for idx in range(0, darray.shape[-1], self._BLOCK_SIZE):
+            block = np.s_[..., idx:idx + self._BLOCK_SIZE]
+            out[block] = darray[block]
+
+        return out
+
     def add_marks(
         self,
         positions: Union[List, Tuple],
@@ -13,6 +13,10 @@ setup(
         'jsonschema',
         'numpy',            
         ],    
+    extras_require={
+        'zstd': ['zstandard'],
+        'arrow': ['pyarrow'],
+        },
     classifiers=[
         'Programming Language :: Python :: 3',
         'Operating System :: OS Independent',
@@ -0,0 +1,17 @@
+import pytest
+
+from epycon.cli.benchmark import write_datalog
+
+
+N_SAMPLES = 20000
+N_CHANNELS = 6
+
+
+@pytest.fixture
+def datalog(tmp_path):
+    """ Path to a synthetic WorkMate x64 datalog of unipolar channels.
+    """
+    f_path = tmp_path / "00000001.log"
+    write_datalog(f_path, N_SAMPLES, N_CHANNELS, seed=1)
+
+    return f_path
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from epycon.iou import LogParser, SampleCache
+
+
+def _read(datalog, **kwargs):
+    with LogParser(datalog, version="4.2", samplesize=4096, **kwargs) as parser:
+        samples = np.concatenate(list(parser))
+        window = parser[500:1500]
+        overview = parser.read_overview(50)
+
+    return samples, window, overview
+
+
+@pytest.mark.parametrize("channels, dtype", [
+    (None, None),
+    (["CH1", "CH4"], "int32"),
+    (["CH0", "CH2", "CH5"], "float32"),
+    (["CH3"], "float64"),
+    ])
+def test_cache_hit_matches_uncached(tmp_path, datalog, channels, dtype):
+    cache = SampleCache(tmp_path / "cache")
+
+    # entry created by a conversion of all channels in raw counts
+    _read(datalog, dtype="int32", cache=cache)
+    entries = list((tmp_path / "cache").iterdir())
+    assert len(entries) == 1
+
+    cached = _read(datalog, channels=channels, dtype=dtype, cache=cache)
+    uncached = _read(datalog, channels=channels, dtype=dtype)
+
+    assert list((tmp_path / "cache").iterdir()) == entries
+    for expected, actual in zip(uncached, cached):
+        assert actual.dtype == expected.dtype
+        assert np.array_equal(actual, expected)
+
+
+def test_eviction_of_least_recently_used(tmp_path, datalog):
+    with LogParser(datalog, version="4.2") as parser:
+        address, shape = parser.get_header().datablock_address, (parser.n_samples, parser.get_header().num_channels)
+
+    nbytes = shape[0] * shape[1] * 4
+    cache = SampleCache(tmp_path / "cache", max_size=2 * nbytes + 1024)
+
+    for key in ("a", "b"):
+        cache.put(key, datalog, address, shape, "<i4")
+    cache.get("a")
+    cache.put("c", datalog, address, shape, "<i4")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
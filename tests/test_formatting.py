@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from epycon.core._formatting import _tocsvrows
+
+
+def _rows(content: bytes):
+    return [line.split(",") for line in content.decode("ascii").splitlines()]
+
+
+@pytest.mark.parametrize("precision", [None, 0, 2, 6])
+def test_matches_printf(precision):
+    rng = np.random.default_rng(0)
+    darray = rng.uniform(-1e5, 1e5, size=(50, 4))
+
+    expected = np.trunc(darray) if precision is None else darray
+    fmt = f"%.{precision or 0}f"
+
+    assert _rows(_tocsvrows(darray, ",", precision)) == [[fmt % value for value in row] for row in expected]
+
+
+def test_large_values_at_high_precision():
+    darray = np.array([[10000.5, 3.9e6], [-2.5e12, 0.125]])
+
+    rows = _rows(_tocsvrows(darray, ",", 15))
+
+    assert rows == [[f"{value:.15f}" for value in row] for row in darray]
+    assert not any(value.startswith("-9223") for row in rows for value in row)
+
+
+def test_values_out_of_int64_range_without_precision():
+    darray = np.array([[1e19, -3.7], [np.inf, 2.0]])
+
+    assert _rows(_tocsvrows(darray, ",")) == [["10000000000000000000", "-3"], ["inf", "2"]]
+
+
+def test_float32_scaled_in_double_precision():
+    darray = np.array([[123456792.0, -0.25]], dtype=np.float32)
+
+    assert _rows(_tocsvrows(darray, ",", 2)) == [["123456792.00", "-0.25"]]
+
+
+def test_integers():
+    darray = np.array([[0, -7, 2**40]], dtype=np.int64)
+
+    assert _rows(_tocsvrows(darray, ",")) == [["0", "-7", str(2**40)]]
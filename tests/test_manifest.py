@@ -0,0 +1,27 @@
+from epycon.cli.manifest import Manifest
+
+
+def _touch(folder, *names):
+    for name in names:
+        (folder / name).write_bytes(b"")
+
+
+def test_outputs_of_previous_format_removed(tmp_path, datalog):
+    study_folder = tmp_path / "out"
+    study_folder.mkdir()
+
+    manifest = Manifest(study_folder, "config")
+    _touch(study_folder, "00000001.h5", "00000001.sel")
+    manifest.record(datalog, ["00000001.h5", "00000001.sel"], complete=True)
+
+    # failed conversion keeps previous outputs until a complete one replaces them
+    manifest.record(datalog, list(), complete=False)
+    assert (study_folder / "00000001.h5").exists()
+
+    _touch(study_folder, "00000001.npy", "00000001.json", "00000001.sel")
+    manifest.record(datalog, ["00000001.npy", "00000001.json", "00000001.sel"], complete=True)
+
+    assert sorted(path.name for path in study_folder.iterdir() if path.name != "manifest.json") == [
+        "00000001.json", "00000001.npy", "00000001.sel",
+        ]
+    assert Manifest(study_folder, "config").isuptodate(datalog)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from epycon.iou import LogParser
+
+from conftest import N_SAMPLES, N_CHANNELS
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_random_access_after_iteration(datalog, mmap):
+    with LogParser(datalog, version="4.2", samplesize=4096, dtype="int32", mmap=mmap) as parser:
+        samples = np.concatenate(list(parser))
+
+        assert samples.shape == (N_SAMPLES, N_CHANNELS)
+        assert np.array_equal(parser[100:2100], samples[100:2100])
+        assert np.array_equal(parser[-1], samples[-1])
+        assert np.array_equal(parser.read_window(1.0, 2.0), samples[2000:4000])
+
+        # iteration stays exhausted
+        assert next(parser, None) is None
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_overview_after_iteration(datalog, mmap):
+    with LogParser(datalog, version="4.2", samplesize=4096, dtype="int32", mmap=mmap) as parser:
+        samples = np.concatenate(list(parser))
+
+        overview = parser.read_overview(100)
+        decimated = parser.read_overview(100, method="decimate")
+
+    bins = samples.reshape(100, -1, N_CHANNELS)
+    assert np.array_equal(overview[..., 0], bins.min(axis=1))
+    assert np.array_equal(overview[..., 1], bins.max(axis=1))
+    assert np.array_equal(decimated, samples[::N_SAMPLES // 100])